@@ -0,0 +1,311 @@
+"""
+Optional Numba-compiled scoring kernel
+
+Mirrors the numeric part of insights.generate_insights (all atomic subscores
+and composites) as one nopython function over plain ints/floats. Numba is an
+optional dependency: when it is not installed _NUMBA_AVAILABLE is False and
+insights falls back to the pure-Python helpers.
+
+Rounding uses np.rint (half-to-even, like round()) and float operations keep
+the scalar code's order, so results are identical to the Python path. The
+health and composite weights are not hard-coded: insights packs
+HEALTH_WEIGHTS / COMPOSITE_WEIGHTS with pack_weights() and passes the arrays
+in, so the kernel always uses the same weights as the Python scorers.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - optional dependency
+    numba = None
+
+_NUMBA_AVAILABLE = numba is not None
+
+# Enums arrive as models.ACTIVITY_ORDINAL / FASTFOOD_ORDINAL ints
+
+# Kernel slots for the components the weights can reference
+COMPONENT_FIELDS = (
+    "activity",
+    "sleep",
+    "stress",
+    "hydration",
+    "nutrition",
+    "smoking",
+    "age",
+    "neat",
+    "training_balance",
+    "nutrition_gap",
+    "activity_gap",
+    "sleep_gap",
+    "hydration_gap",
+    "smoking_risk",
+    "age_risk",
+)
+
+# Composites computed from the packed weights, in kernel order
+COMPOSITE_FIELDS = ("recovery", "lifestyle", "energy", "metabolic_load", "cardio_risk")
+
+_N_COMPONENTS = len(COMPONENT_FIELDS)
+_N_COMPOSITES = len(COMPOSITE_FIELDS)
+
+# Output order of _compute_all_scores
+SCORE_FIELDS = (
+    "activity",
+    "sleep",
+    "stress",
+    "hydration",
+    "nutrition",
+    "smoking",
+    "age",
+    "health",
+    "neat",
+    "recovery_debt",
+    "nutrition_stability",
+    "habit_score",
+    "recovery",
+    "lifestyle",
+    "energy",
+    "metabolic_load",
+    "cardio_risk",
+    "consistency",
+    "readiness",
+)
+
+
+def pack_weights(
+    health_weights: dict[str, int],
+    composite_weights: dict[str, tuple[tuple[str, float], ...]],
+) -> tuple[np.ndarray, ...]:
+    """
+    Flatten weight tables into the kernel's array arguments:
+    (health_idx, health_w, term_idx, term_w, term_end). Composite terms keep
+    their listed order; term_end[i] is the end of COMPOSITE_FIELDS[i]'s
+    terms in term_idx/term_w.
+    """
+    slot = {key: i for i, key in enumerate(COMPONENT_FIELDS)}
+    terms = [
+        (slot[key], weight)
+        for name in COMPOSITE_FIELDS
+        for key, weight in composite_weights[name]
+    ]
+    term_end = np.cumsum([len(composite_weights[name]) for name in COMPOSITE_FIELDS])
+    return (
+        np.array([slot[key] for key in health_weights], dtype=np.int64),
+        np.array(list(health_weights.values()), dtype=np.int64),
+        np.array([i for i, _ in terms], dtype=np.int64),
+        np.array([w for _, w in terms], dtype=np.float64),
+        term_end.astype(np.int64),
+    )
+
+
+def _round100(x):
+    """clamp(int(round(x)), 0, 100)"""
+    return min(100, max(0, int(np.rint(x))))
+
+
+def _compute_all_scores(
+    level_i,
+    workouts,
+    sleep,
+    stress,
+    water,
+    ff_i,
+    smokes,
+    age,
+    health_idx,
+    health_w,
+    term_idx,
+    term_w,
+    term_end,
+):
+    """
+    All numeric scores for one survey, in SCORE_FIELDS order.
+    The trailing arguments are the weight arrays from pack_weights().
+    """
+    # Activity: LOW, MEDIUM, HIGH, VERY_HIGH
+    if level_i == 0:
+        activity_base, neat_base = 25, 30
+    elif level_i == 1:
+        activity_base, neat_base = 50, 55
+    elif level_i == 2:
+        activity_base, neat_base = 70, 70
+    else:
+        activity_base, neat_base = 85, 80
+    mismatch = 0
+    if level_i >= 2 and workouts <= 1:
+        mismatch += 10
+    if level_i == 0 and workouts >= 5:
+        mismatch += 6
+    activity = min(100, max(0, activity_base + min(28, max(0, workouts * 4)) - mismatch))
+    neat = min(100, max(0, neat_base + min(18, max(0, workouts * 3))))
+
+    diff = abs(sleep - 8.0)
+    sleep_s = _round100(100.0 - (diff * diff * 6.0))
+    stress_s = min(100, max(0, 110 - stress * 10))
+    hydration = 0 if water <= 0 else _round100(40 + water * 24)
+
+    # Nutrition: NEVER, RARELY, SOMETIMES, OFTEN, VERY_OFTEN
+    if ff_i == 0:
+        nutrition = 95
+    elif ff_i == 1:
+        nutrition = 80
+    elif ff_i == 2:
+        nutrition = 60
+    elif ff_i == 3:
+        nutrition = 35
+    else:
+        nutrition = 15
+
+    smoking = 20 if smokes else 90
+    age_t = (age - 18) / (80 - 18)
+    age_mod = _round100(95 - age_t * 40)
+
+    debt = 0.0
+    if sleep < 7.0:
+        debt += (7.0 - sleep) * 18.0
+    debt += max(0, stress - 5) * 8.0
+    if workouts >= 5:
+        debt += (workouts - 4) * 7.0
+    recovery_debt = _round100(debt)
+
+    penalty = 0
+    if stress >= 8:
+        penalty = 12
+    elif stress >= 6:
+        penalty = 6
+    nutrition_stability = min(100, max(0, nutrition - penalty))
+
+    habit_score = _round100(0.45 * nutrition + 0.35 * smoking + 0.20 * hydration)
+
+    if workouts == 0:
+        balance = 60
+    elif workouts <= 2:
+        balance = 75
+    elif workouts <= 4:
+        balance = 90
+    elif workouts <= 6:
+        balance = 80
+    else:
+        balance = 70
+
+    # Component values in COMPONENT_FIELDS order
+    comp = np.empty(_N_COMPONENTS, dtype=np.int64)
+    comp[0] = activity
+    comp[1] = sleep_s
+    comp[2] = stress_s
+    comp[3] = hydration
+    comp[4] = nutrition
+    comp[5] = smoking
+    comp[6] = age_mod
+    comp[7] = neat
+    comp[8] = balance
+    comp[9] = 100 - nutrition
+    comp[10] = 100 - activity
+    comp[11] = 100 - sleep_s
+    comp[12] = 100 - hydration
+    comp[13] = 90 if smokes else 10
+    comp[14] = _round100(10 + age_t * 60)
+
+    # Health: integer weighted sum, divided with round-half-even like round_div
+    num = 0
+    den = 0
+    for j in range(len(health_idx)):
+        num += health_w[j] * comp[health_idx[j]]
+        den += health_w[j]
+    health = 0
+    if den > 0:
+        q = num // den
+        r = num - q * den
+        if 2 * r > den or (2 * r == den and q % 2 == 1):
+            q += 1
+        health = min(100, max(0, q))
+
+    # Composites: terms summed in listed order, like linear_score
+    composites = np.empty(_N_COMPOSITES, dtype=np.int64)
+    start = 0
+    for i in range(_N_COMPOSITES):
+        total = 0.0
+        for j in range(start, term_end[i]):
+            total += term_w[j] * comp[term_idx[j]]
+        composites[i] = _round100(total)
+        start = term_end[i]
+    recovery = composites[0]
+    lifestyle = composites[1]
+    energy = composites[2]
+    metabolic_load = composites[3]
+    cardio_risk = composites[4]
+
+    s = 60
+    if workouts == 0:
+        s -= 10
+    elif workouts == 1:
+        s -= 5
+    elif workouts <= 4:
+        s += 10
+    else:
+        s += 6
+    if 7.0 <= sleep <= 9.0:
+        s += 12
+    elif sleep < 6.0:
+        s -= 12
+    else:
+        s -= 4
+    if ff_i >= 3:
+        s -= 10
+    elif ff_i <= 1:
+        s += 6
+    if water >= 1.8:
+        s += 6
+    elif water < 1.0:
+        s -= 8
+    consistency = min(100, max(0, s))
+
+    r = 0.55 * recovery + 0.45 * energy
+    r -= 0.20 * cardio_risk
+    r -= 0.10 * metabolic_load
+    readiness = _round100(r)
+
+    return (
+        activity,
+        sleep_s,
+        stress_s,
+        hydration,
+        nutrition,
+        smoking,
+        age_mod,
+        health,
+        neat,
+        recovery_debt,
+        nutrition_stability,
+        habit_score,
+        recovery,
+        lifestyle,
+        energy,
+        metabolic_load,
+        cardio_risk,
+        consistency,
+        readiness,
+    )
+
+
+if _NUMBA_AVAILABLE:
+    _round100 = numba.njit(cache=True)(_round100)
+    _compute_all_scores = numba.njit(cache=True)(_compute_all_scores)
+
+    # Compile now so the first request doesn't pay for it (argument types
+    # are all that matter here, not the weights)
+    _compute_all_scores(
+        1,
+        3,
+        7.5,
+        5,
+        2.0,
+        1,
+        False,
+        30,
+        *pack_weights(
+            {"activity": 1},
+            {name: (("sleep", 1.0),) for name in COMPOSITE_FIELDS},
+        ),
+    )
@@ -3,11 +3,28 @@ SQLite database setup and CRUD operations for Fizikl
 """
 
 import json
-import sqlite3
+import logging
+import os
+import queue
+import threading
+import time
 import uuid
-from datetime import datetime
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Final, Iterator, Optional
+
+import zstandard
+from pydantic import TypeAdapter
+
+# Prefer the pysqlite3 build: it bundles a much newer SQLite amalgamation than
+# the one the interpreter links against. The DB-API surface is identical.
+try:
+    import pysqlite3.dbapi2 as sqlite3
+except ImportError:
+    import sqlite3
 
 from .models import SurveyAnswers, Summary, SurveyRecord
 
@@ -19,37 +36,538 @@ if not DB_PATH.parent.exists():
     DB_PATH = Path(__file__).parent.parent / "data" / "fizikl.db"
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+# Current schema version, stored in PRAGMA user_version
+SCHEMA_VERSION = 5
+
+# Number of idle read connections kept open for reuse. WAL lets readers run
+# in parallel with each other and with the writer.
+READ_POOL_SIZE = os.cpu_count() or 4
+
+# Rows per fetchmany() round trip when streaming recent surveys
+FETCH_BATCH_SIZE = 64
+
+# Max pending saves the background writer commits in one transaction
+WRITE_BATCH_MAX = 500
+
+# A failed group commit is retried this many times (after WRITE_RETRY_DELAY
+# seconds) before its rows are dropped; queue_survey callers already have
+# their IDs, so a transient error (e.g. disk full, I/O error) shouldn't lose them
+WRITE_RETRIES = 3
+WRITE_RETRY_DELAY = 0.5
+
+# Payloads at least this large are zstd-compressed before storing
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_LEVEL = 3
+
+# Newest surveys mirrored into the in-memory hot set; get_recent_surveys
+# calls up to this limit never touch the database file
+RECENT_CACHE_SIZE = 1000
+
+# Max survey records kept in the in-process lookup cache
+SURVEY_CACHE_SIZE = 4096
+
+# Connection pools: one persistent read-write connection shared under a lock
+# (SQLite serializes writers anyway) + a LIFO stack of read-only connections
+# (LIFO keeps the most recently used, cache-warm connections in rotation)
+_read_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=READ_POOL_SIZE)
+_write_conn: Optional[sqlite3.Connection] = None
+_write_lock = threading.Lock()
+
+# A stored survey row: (id, answers blob, results blob, created_at), the
+# same layout the SELECT statements return
+_Row = tuple[str, bytes, bytes, int]
 
-def get_connection() -> sqlite3.Connection:
-    """Get database connection with row factory"""
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+logger = logging.getLogger(__name__)
+
+# Pending single-survey saves for the background writer (group commit),
+# with the number of failed attempts so far
+_write_queue: "queue.Queue[tuple[_Row, Future[str], int]]" = queue.Queue()
+
+# Queued rows not yet committed, by ID. Lookups check here first, so an ID
+# handed out by queue_survey() is readable right away.
+_pending: dict[str, _Row] = {}
+
+# Set once init_db() has run in this process
+_initialized = False
+
+# Per-process in-memory database holding the hot set (table mem.recent).
+# Every pooled connection attaches it; it lives as long as any of them is
+# open, and the writer connection never closes. Being per process, a survey
+# saved by another worker process only shows up here after a restart.
+_MEM_DB_URI = f"file:fizikl_recent_{os.getpid()}?mode=memory&cache=shared"
+
+# created_at is stored as integer microseconds since this instant
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Every zstd frame starts with these bytes; JSON text never does, so stored
+# payloads are self-describing (rows written uncompressed still read fine)
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# zstd (de)compressor objects must not be used by two threads at once
+_zstd_local = threading.local()
+
+# (De)serializers for the answers/results payload columns. dump_json returns
+# UTF-8 bytes straight from pydantic-core (no intermediate str); validate_json
+# parses those bytes in a single native pass.
+_ANSWERS_ADAPTER: TypeAdapter[SurveyAnswers] = TypeAdapter(SurveyAnswers)
+_SUMMARY_ADAPTER: TypeAdapter[Summary] = TypeAdapter(Summary)
+_RECORD_ADAPTER: TypeAdapter[SurveyRecord] = TypeAdapter(SurveyRecord)
+_RECORDS_ADAPTER: TypeAdapter[list[SurveyRecord]] = TypeAdapter(list[SurveyRecord])
+_DATETIME_ADAPTER: TypeAdapter[datetime] = TypeAdapter(datetime)
+
+
+# SQL statements are module-level constants: sqlite3 caches prepared
+# statements per connection keyed by SQL text, so with pooled connections
+# every call after the first is just bind + step.
+_SQL_INSERT_SURVEY: Final[str] = """
+    INSERT INTO surveys (id, answers, results, created_at)
+    VALUES (?, ?, ?, ?)
+"""
+
+_SQL_INSERT_RECENT: Final[str] = """
+    INSERT INTO mem.recent (id, answers, results, created_at)
+    VALUES (?, ?, ?, ?)
+"""
+
+_SQL_TRIM_RECENT: Final[str] = """
+    DELETE FROM mem.recent
+    WHERE rowid IN (
+        SELECT rowid FROM mem.recent
+        ORDER BY created_at DESC, id
+        LIMIT -1 OFFSET ?
+    )
+"""
+
+_SQL_GET_SURVEY: Final[str] = """
+    SELECT id, answers, results, created_at
+    FROM surveys
+    WHERE id = ?
+"""
+
+_SQL_RECENT_SURVEYS: Final[str] = """
+    SELECT id, answers, results, created_at
+    FROM surveys
+    ORDER BY created_at DESC, id
+    LIMIT ?
+"""
+
+_SQL_RECENT_SURVEYS_MEM: Final[str] = """
+    SELECT id, answers, results, created_at
+    FROM mem.recent
+    ORDER BY created_at DESC, id
+    LIMIT ?
+"""
+
+
+def get_connection(readonly: bool = False) -> sqlite3.Connection:
+    """
+    Open a new database connection with per-connection PRAGMAs.
+    Connections are in autocommit mode and may be shared across threads.
+    Rows are plain tuples (no row factory); readers index them by position.
+    No detect_types: BLOB payload columns come back as raw bytes.
+    Read-only connections are opened with mode=ro and can never take the
+    write lock.
+    """
+    mode = "ro" if readonly else "rwc"
+    conn = sqlite3.connect(
+        f"{DB_PATH.resolve().as_uri()}?mode={mode}",
+        uri=True,
+        check_same_thread=False,
+        isolation_level=None
+    )
+
+    # WAL only needs a single fsync per commit with synchronous=NORMAL
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")  # ~64 MB page cache
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    conn.execute("PRAGMA busy_timeout=5000")
+
+    # Hot set of recent surveys. Readers skip shared-cache table locks so
+    # they never block on (or block) the writer updating mem.recent.
+    conn.execute("ATTACH DATABASE ? AS mem", (_MEM_DB_URI,))
+    if readonly:
+        conn.execute("PRAGMA read_uncommitted=1")
     return conn
 
 
+@contextmanager
+def borrow_conn(readonly: bool = True) -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a pooled connection for the duration of the block.
+    Writes go through a single shared connection serialized by a lock,
+    which avoids SQLITE_BUSY between writers on the WAL. Reads get a
+    read-only connection from the reader pool.
+    """
+    global _write_conn
+
+    if not readonly:
+        with _write_lock:
+            if _write_conn is None:
+                _write_conn = get_connection()
+            yield _write_conn
+        return
+
+    try:
+        conn = _read_pool.get_nowait()
+    except queue.Empty:
+        conn = get_connection(readonly=True)
+
+    try:
+        yield conn
+    finally:
+        try:
+            _read_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+def _encode_payload(data: bytes) -> bytes:
+    """Compress a JSON payload for storage if it is large enough to benefit"""
+    if len(data) < COMPRESS_MIN_BYTES:
+        return data
+
+    compressor = getattr(_zstd_local, "compressor", None)
+    if compressor is None:
+        compressor = _zstd_local.compressor = zstandard.ZstdCompressor(level=COMPRESS_LEVEL)
+    return compressor.compress(data)
+
+
+def _decode_payload(blob: bytes) -> bytes:
+    """Return the JSON bytes of a stored payload, decompressing if needed"""
+    if blob[:4] != _ZSTD_MAGIC:
+        return blob
+
+    decompressor = getattr(_zstd_local, "decompressor", None)
+    if decompressor is None:
+        decompressor = _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    return decompressor.decompress(blob)
+
+
+def _row_to_record(row: _Row) -> SurveyRecord:
+    """
+    Build a SurveyRecord from a `SELECT id, answers, results, created_at` row.
+    Payloads are bytes and go to the JSON parser without a str decode.
+    """
+    survey_id, answers, results, created_at = row
+    return SurveyRecord(
+        id=survey_id,
+        answers=_ANSWERS_ADAPTER.validate_json(_decode_payload(answers)),
+        results=_SUMMARY_ADAPTER.validate_json(_decode_payload(results)),
+        created_at=_EPOCH + timedelta(microseconds=created_at)
+    )
+
+
+def _row_to_json(row: _Row) -> bytes:
+    """
+    Build SurveyRecord JSON from a `SELECT id, answers, results, created_at`
+    row. The stored payloads are already the JSON pydantic would emit, so
+    the record is spliced together without parsing them.
+    """
+    survey_id, answers, results, created_at = row
+    return b'{"id":%b,"answers":%b,"results":%b,"created_at":%b}' % (
+        json.dumps(survey_id).encode(),
+        _decode_payload(answers),
+        _decode_payload(results),
+        _DATETIME_ADAPTER.dump_json(_EPOCH + timedelta(microseconds=created_at))
+    )
+
+
+def _create_schema(cursor: sqlite3.Cursor, table: str = "surveys") -> None:
+    """Create the surveys table (current schema) under the given name"""
+    # Payloads are JSON stored as BLOB (see _encode_payload), not SQLite
+    # JSONB: nothing queries into them in SQL, and JSONB would add a jsonb()
+    # parse on every write and a json() re-encode on every read for a ~7%
+    # size saving.
+    # The app generates id and created_at itself (see _new_row); the SQLite
+    # defaults produce the same formats for rows inserted by hand.
+    # created_at is integer microseconds since the Unix epoch (UTC), which
+    # sorts as a plain integer and converts without string parsing.
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            id TEXT NOT NULL PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+            answers BLOB NOT NULL,
+            results BLOB NOT NULL,
+            created_at INTEGER NOT NULL
+                DEFAULT (CAST(round((julianday('now') - 2440587.5) * 86400000000) AS INTEGER))
+        )
+    """)
+
+
+def _migrate(cursor: sqlite3.Cursor, version: int) -> None:
+    """Upgrade an existing surveys table from `version` to SCHEMA_VERSION"""
+    if version < 4:
+        # Column types and defaults can't be altered in place, so rebuild the
+        # table in the current layout:
+        #   v1 - SQLite-side defaults for id/created_at
+        #   v2 - covering idx_surveys_recent (old index goes with the table)
+        #   v3 - TEXT payloads re-stored as BLOB
+        #   v4 - ISO-8601 created_at converted to integer microseconds
+        cursor.execute("BEGIN")
+        _create_schema(cursor, "surveys_new")
+        cursor.execute("""
+            INSERT INTO surveys_new (id, answers, results, created_at)
+            SELECT
+                id,
+                CAST(answers AS BLOB),
+                CAST(results AS BLOB),
+                CAST(strftime('%s', created_at) AS INTEGER) * 1000000
+                    + CAST(substr(substr(created_at, 21) || '000000', 1, 6) AS INTEGER)
+            FROM surveys
+        """)
+        cursor.execute("DROP TABLE surveys")
+        cursor.execute("ALTER TABLE surveys_new RENAME TO surveys")
+        cursor.execute("PRAGMA user_version=4")
+        cursor.execute("COMMIT")
+
+    if version < 5:
+        # v5 - the recent-list index no longer copies the payload BLOBs
+        # (it made the file ~3x larger and doubled insert cost). The freed
+        # pages are reused by later inserts; VACUUM shrinks the file.
+        cursor.execute("DROP INDEX IF EXISTS idx_surveys_recent")
+        cursor.execute("PRAGMA user_version=5")
+
+
 def init_db() -> None:
-    """Initialize database schema"""
+    """
+    Initialize database schema, migrating older databases in place.
+    Called explicitly at app startup; repeat calls in the same process are free.
+    """
+    global _initialized
+
+    if _initialized:
+        return
+
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS surveys (
-            id TEXT PRIMARY KEY,
-            answers JSON NOT NULL,
-            results JSON NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    # Persistent settings (stored in the database file itself).
+    # auto_vacuum only takes effect before the database header is first
+    # written (or after VACUUM), so it must come before journal_mode=WAL,
+    # which writes the header.
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cursor.execute("PRAGMA journal_mode=WAL")
+
+    table_exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'surveys'"
+    ).fetchone()
+
+    if table_exists:
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        _migrate(cursor, version)
+    else:
+        _create_schema(cursor)
+        cursor.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
 
-    # Create index for faster lookups
+    # Index for the ORDER BY ... LIMIT scan of get_recent_surveys beyond the
+    # in-memory hot set. Payloads are read from the table: copying the BLOBs
+    # into the index would store them twice on every insert.
     cursor.execute("""
         CREATE INDEX IF NOT EXISTS idx_surveys_created_at
-        ON surveys(created_at DESC)
+        ON surveys(created_at DESC, id)
     """)
 
-    conn.commit()
     conn.close()
 
+    # Load the hot set through the writer, which keeps the memory DB alive
+    with borrow_conn(readonly=False) as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS mem.recent (
+                id TEXT NOT NULL PRIMARY KEY,
+                answers BLOB NOT NULL,
+                results BLOB NOT NULL,
+                created_at INTEGER NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS mem.idx_recent_created_at
+            ON recent(created_at DESC, id)
+        """)
+        conn.execute("DELETE FROM mem.recent")
+        conn.execute(
+            """
+            INSERT INTO mem.recent (id, answers, results, created_at)
+            SELECT id, answers, results, created_at
+            FROM surveys
+            ORDER BY created_at DESC, id
+            LIMIT ?
+            """,
+            (RECENT_CACHE_SIZE,)
+        )
+
+    threading.Thread(
+        target=_writer_loop, name="fizikl-db-writer", daemon=True
+    ).start()
+
+    _initialized = True
+
+
+def _new_row(answers: SurveyAnswers, results: Summary) -> _Row:
+    """
+    Encode a survey for storage with a fresh ID (32 lowercase hex chars,
+    like the column default) and created_at set to now.
+    """
+    return (
+        uuid.uuid4().hex,
+        _encode_payload(_ANSWERS_ADAPTER.dump_json(answers)),
+        _encode_payload(_SUMMARY_ADAPTER.dump_json(results)),
+        time.time_ns() // 1000
+    )
+
+
+def _insert_surveys(conn: sqlite3.Connection, rows: list[_Row]) -> None:
+    """
+    Insert rows in one transaction, mirroring each into the mem.recent hot
+    set. Must be called with the writer connection.
+    """
+    conn.execute("BEGIN")
+    try:
+        conn.executemany(_SQL_INSERT_SURVEY, rows)
+        conn.executemany(_SQL_INSERT_RECENT, rows)
+        conn.execute(_SQL_TRIM_RECENT, (RECENT_CACHE_SIZE,))
+        conn.execute("COMMIT")
+    except BaseException:
+        # A failed COMMIT can leave the transaction open; roll it back so the
+        # shared writer connection can BEGIN again. (SQLite may already have
+        # rolled back itself, e.g. after an I/O error.)
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+def _writer_loop() -> None:
+    """
+    Background writer: commits queued saves in groups.
+    Whatever queued up while the previous commit was running goes into the
+    next transaction, so concurrent callers share one fsync without any
+    added wait when the queue is quiet.
+    """
+    while True:
+        batch = [_write_queue.get()]
+        while len(batch) < WRITE_BATCH_MAX:
+            try:
+                batch.append(_write_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        try:
+            _commit_batch(batch)
+        except Exception:
+            # Never let a bug end the writer thread: later saves would queue
+            # up forever and flush_writes() would hang
+            logger.exception(
+                "Survey writer failed, dropping %d survey(s): %s",
+                len(batch), ", ".join(row[0] for row, _, _ in batch)
+            )
+            for row, future, _ in batch:
+                _pending.pop(row[0], None)
+                if not future.done():
+                    future.set_exception(RuntimeError(f"Survey {row[0]} was not saved"))
+        finally:
+            for _ in batch:
+                _write_queue.task_done()
+
+
+def _commit_batch(batch: list[tuple[_Row, "Future[str]", int]]) -> None:
+    """
+    Insert one group of queued rows and resolve their futures.
+    Futures are marked running on first pickup, so a caller can no longer
+    cancel them while the commit is in flight; rows whose future was
+    cancelled before that are still saved, only the result is dropped.
+    """
+    for _, future, attempts in batch:
+        if attempts == 0:
+            future.set_running_or_notify_cancel()
+
+    rows = [row for row, _, _ in batch]
+
+    try:
+        with borrow_conn(readonly=False) as conn:
+            _insert_surveys(conn, rows)
+    except Exception as exc:
+        _handle_failed_batch(batch, exc)
+    else:
+        for row, future, _ in batch:
+            _pending.pop(row[0], None)
+            if not future.cancelled():
+                future.set_result(row[0])
+
+
+def _handle_failed_batch(
+    batch: list[tuple[_Row, "Future[str]", int]],
+    exc: Exception
+) -> None:
+    """
+    Re-queue the rows of a failed commit, or give up on those that have
+    used up WRITE_RETRIES. Rows stay readable from _pending while retried.
+    Called from the writer's except block, so the traceback is logged.
+    """
+    retry = [item for item in batch if item[2] < WRITE_RETRIES]
+    dropped = [item for item in batch if item[2] >= WRITE_RETRIES]
+
+    if retry:
+        logger.warning(
+            "Saving %d survey(s) failed, retrying in %.1fs: %s",
+            len(retry), WRITE_RETRY_DELAY, ", ".join(row[0] for row, _, _ in retry),
+            exc_info=True
+        )
+        time.sleep(WRITE_RETRY_DELAY)
+        for row, future, attempts in retry:
+            _write_queue.put((row, future, attempts + 1))
+
+    if dropped:
+        logger.exception(
+            "Giving up on %d survey(s) after %d retries, they are lost: %s",
+            len(dropped), WRITE_RETRIES, ", ".join(row[0] for row, _, _ in dropped)
+        )
+        for row, future, _ in dropped:
+            _pending.pop(row[0], None)
+            if not future.cancelled():
+                future.set_exception(exc)
+
+
+def _enqueue_row(row: _Row) -> "Future[str]":
+    """Hand a row to the background writer and make it readable meanwhile"""
+    if not _initialized:
+        raise RuntimeError("Database is not initialized; call init_db() first")
+
+    future: Future[str] = Future()
+    _pending[row[0]] = row
+    _write_queue.put((row, future, 0))
+    return future
+
+
+def enqueue_survey(
+    answers: SurveyAnswers,
+    results: Summary
+) -> "Future[str]":
+    """
+    Queue survey answers and results for the background writer.
+    Returns a future resolving to the generated survey ID once committed.
+    Async callers can await it via asyncio.wrap_future; cancelling the
+    awaiting task only drops the result, the survey is still saved.
+    """
+    return _enqueue_row(_new_row(answers, results))
+
+
+def queue_survey(
+    answers: SurveyAnswers,
+    results: Summary
+) -> str:
+    """
+    Queue survey answers and results for the background writer without
+    waiting for the commit. Returns the generated survey ID immediately;
+    get_survey/get_survey_json serve it from memory until it is written.
+    """
+    row = _new_row(answers, results)
+    _enqueue_row(row)
+    return row[0]
+
+
+def flush_writes() -> None:
+    """Block until every queued save has been committed (or has failed)"""
+    _write_queue.join()
+
 
 def save_survey(
     answers: SurveyAnswers,
@@ -57,87 +575,108 @@ def save_survey(
 ) -> str:
     """
     Save survey answers and results to database.
+    Payloads are stored as JSON-encoded BLOBs (zstd-compressed when large).
+    Blocks until the background writer has committed the row.
     Returns the generated survey ID.
     """
-    survey_id = str(uuid.uuid4())
+    return enqueue_survey(answers, results).result()
 
-    conn = get_connection()
-    cursor = conn.cursor()
 
-    cursor.execute(
-        """
-        INSERT INTO surveys (id, answers, results, created_at)
-        VALUES (?, ?, ?, ?)
-        """,
-        (
-            survey_id,
-            answers.model_dump_json(),
-            results.model_dump_json(),
-            datetime.utcnow().isoformat()
-        )
-    )
+def save_surveys_bulk(
+    items: list[tuple[SurveyAnswers, Summary]]
+) -> list[str]:
+    """
+    Save many (answers, results) pairs in a single transaction.
+    One BEGIN/COMMIT (and one WAL fsync) covers the whole batch.
+    Returns the generated survey IDs in input order.
+    """
+    rows = [_new_row(answers, results) for answers, results in items]
 
-    conn.commit()
-    conn.close()
+    with borrow_conn(readonly=False) as conn:
+        _insert_surveys(conn, rows)
 
-    return survey_id
+    return [row[0] for row in rows]
 
 
-def get_survey(survey_id: str) -> Optional[SurveyRecord]:
+@lru_cache(maxsize=SURVEY_CACHE_SIZE)
+def _get_survey_json_cached(survey_id: str) -> bytes:
     """
-    Get survey by ID.
+    Load survey by ID as SurveyRecord JSON bytes, memoized. Records never
+    change after insert and IDs are never reused, so cached entries need no
+    invalidation.
+    Raises LookupError if not found (exceptions are not cached, so an ID
+    that is saved later is still picked up).
+    """
+    with borrow_conn() as conn:
+        row = conn.execute(_SQL_GET_SURVEY, (survey_id,)).fetchone()
+
+    if row is None:
+        raise LookupError(survey_id)
+
+    return _row_to_json(row)
+
+
+def get_survey_json(survey_id: str) -> Optional[bytes]:
+    """
+    Get survey by ID as serialized SurveyRecord JSON.
     Returns None if not found.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    row = _pending.get(survey_id)
+    if row is not None:
+        return _row_to_json(row)
 
-    cursor.execute(
-        "SELECT id, answers, results, created_at FROM surveys WHERE id = ?",
-        (survey_id,)
-    )
+    try:
+        return _get_survey_json_cached(survey_id)
+    except LookupError:
+        return None
 
-    row = cursor.fetchone()
-    conn.close()
 
-    if row is None:
+def get_survey(survey_id: str) -> Optional[SurveyRecord]:
+    """
+    Get survey by ID.
+    Returns None if not found.
+    """
+    record = get_survey_json(survey_id)
+    if record is None:
         return None
 
-    return SurveyRecord(
-        id=row["id"],
-        answers=SurveyAnswers.model_validate_json(row["answers"]),
-        results=Summary.model_validate_json(row["results"]),
-        created_at=datetime.fromisoformat(row["created_at"])
-    )
+    return _RECORD_ADAPTER.validate_json(record)
 
 
-def get_recent_surveys(limit: int = 10) -> list[SurveyRecord]:
-    """Get most recent surveys"""
-    conn = get_connection()
-    cursor = conn.cursor()
+def _recent_surveys_sql(limit: int) -> str:
+    """Pick the recent-list query: the in-memory hot set when it covers limit"""
+    if limit <= RECENT_CACHE_SIZE:
+        return _SQL_RECENT_SURVEYS_MEM
+    return _SQL_RECENT_SURVEYS
 
-    cursor.execute(
-        """
-        SELECT id, answers, results, created_at
-        FROM surveys
-        ORDER BY created_at DESC
-        LIMIT ?
-        """,
-        (limit,)
-    )
 
-    rows = cursor.fetchall()
-    conn.close()
+def get_recent_surveys(limit: int = 10) -> Iterator[SurveyRecord]:
+    """
+    Iterate over the most recent surveys, newest first.
+    Served from the in-memory hot set when limit <= RECENT_CACHE_SIZE.
+    Rows are fetched FETCH_BATCH_SIZE at a time and decoded as they are
+    consumed; the reader connection is held until the iterator is exhausted
+    or closed.
+    """
+    with borrow_conn() as conn:
+        cursor = conn.execute(_recent_surveys_sql(limit), (limit,))
+        cursor.arraysize = FETCH_BATCH_SIZE
 
-    return [
-        SurveyRecord(
-            id=row["id"],
-            answers=SurveyAnswers.model_validate_json(row["answers"]),
-            results=Summary.model_validate_json(row["results"]),
-            created_at=datetime.fromisoformat(row["created_at"])
-        )
-        for row in rows
-    ]
+        while rows := cursor.fetchmany():
+            for row in rows:
+                yield _row_to_record(row)
+
+
+def get_recent_surveys_list(limit: int = 10) -> list[SurveyRecord]:
+    """
+    Get most recent surveys as a list.
+    The stored payloads are spliced into one JSON array and validated in a
+    single pydantic-core call instead of one parse per record.
+    """
+    with borrow_conn() as conn:
+        rows = conn.execute(_recent_surveys_sql(limit), (limit,)).fetchall()
 
+    # Payloads may be zstd-compressed, so the array is built here rather
+    # than with json_group_array() in SQL
+    return _RECORDS_ADAPTER.validate_json(b"[" + b",".join(map(_row_to_json, rows)) + b"]")
 
-# Initialize database on module import
-init_db()
@@ -6,11 +6,22 @@ Original: insights.go (~1200 lines)
 This port maintains identical logic and output structure.
 """
 
+import heapq
 import math
+import os
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from enum import IntFlag
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Final, NamedTuple, Optional
 
+from ._scoring_numba import _NUMBA_AVAILABLE, _compute_all_scores, pack_weights
 from .models import (
+    ACTIVITY_ORDINAL,
+    FASTFOOD_ORDINAL,
     ActivityLevel,
     Alert,
     Charts,
@@ -32,42 +43,141 @@ from .models import (
     UserInfo,
 )
 
+# Chart/target labels shared by radar, dimensions, risk and targets
+LABEL_ACTIVITY: Final = "Активность"
+LABEL_NEAT: Final = "Движение (NEAT)"
+LABEL_SLEEP: Final = "Сон"
+LABEL_STRESS: Final = "Стресс"
+LABEL_HYDRATION: Final = "Вода"
+LABEL_NUTRITION: Final = "Питание"
+LABEL_HABITS: Final = "Привычки"
+LABEL_SMOKING: Final = "Курение"
+
+# Memoized generate_insights results (override with INSIGHTS_CACHE_SIZE)
+INSIGHTS_CACHE_SIZE = int(os.getenv("INSIGHTS_CACHE_SIZE", "4096"))
+
+# Cache key layout for generate_insights. The name is not part of the key:
+# only whether it is blank affects scoring, the text itself is spliced in.
+_KEY_FIELDS = tuple(f for f in SurveyAnswers.model_fields if f != "name")
+_key_values = attrgetter(*_KEY_FIELDS)
+SUMMARY_NAME_PLACEHOLDER: Final = "_"
+
+# Numeric inputs read by the scoring code, in one C-level call
+_score_inputs = attrgetter(
+    "activity_level",
+    "workouts_per_week",
+    "sleep_hours",
+    "stress_level",
+    "water_liters",
+    "fastfood_frequency",
+    "smokes",
+    "age",
+)
+
+
+# Enum groups used in membership tests. Built once: `x in (A.B, A.C)`
+# rebuilds the tuple per call, and tuples (unlike sets) match members by
+# identity without calling the Python-level Enum.__hash__.
+_HIGH_ACTIVITY = (ActivityLevel.HIGH, ActivityLevel.VERY_HIGH)
+_FREQUENT_FASTFOOD = (FastFoodFrequency.OFTEN, FastFoodFrequency.VERY_OFTEN)
+_RARE_FASTFOOD = (FastFoodFrequency.NEVER, FastFoodFrequency.RARELY)
+
 
 # ---------- Validation ----------
 
-def validate(answers: SurveyAnswers) -> tuple[list[str], list[str]]:
+class DataQuality(IntFlag):
+    """Soft data-quality issues found in survey answers"""
+    NAME_MISSING = 1
+    MISMATCH_HIGH_NO_WORKOUTS = 2
+    MISMATCH_LOW_MANY_WORKOUTS = 4
+    WATER_ZERO = 8
+    SLEEP_VERY_LOW = 16
+
+
+# (flag, user-facing warning, debug note) in output order
+_DATA_QUALITY_MESSAGES = (
+    (
+        DataQuality.NAME_MISSING,
+        "Имя не заполнено — будет использован плейсхолдер.",
+        None,
+    ),
+    (
+        DataQuality.MISMATCH_HIGH_NO_WORKOUTS,
+        "Несостыковка: высокий уровень активности при 0 тренировок/нед.",
+        "mismatch.activity_vs_workouts",
+    ),
+    (
+        DataQuality.MISMATCH_LOW_MANY_WORKOUTS,
+        "Несостыковка: низкий уровень активности при 6–7 тренировок/нед.",
+        "mismatch.activity_low_but_many_workouts",
+    ),
+    (
+        DataQuality.WATER_ZERO,
+        "Вода указана как 0 л — возможно, значение пропущено.",
+        "water.zero",
+    ),
+    (
+        DataQuality.SLEEP_VERY_LOW,
+        "Очень низкий сон — проверьте, что указано среднее значение.",
+        "sleep.very_low",
+    ),
+)
+
+
+def _render_data_quality(flags: int) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Warnings and notes for a DataQuality bitmask"""
+    dq = tuple(text for flag, text, _ in _DATA_QUALITY_MESSAGES if flags & flag)
+    notes = tuple(
+        note for flag, _, note in _DATA_QUALITY_MESSAGES if flags & flag and note
+    )
+    return dq, notes
+
+
+# Rendered warnings/notes for every possible bitmask
+_DATA_QUALITY_RENDERED = tuple(
+    _render_data_quality(flags) for flags in range(1 << len(DataQuality))
+)
+
+
+def validate_flags(answers: SurveyAnswers, name: str) -> int:
     """
-    Validate answers and return data quality warnings and notes.
-    Raises ValueError for hard validation errors.
+    Check answers for soft data-quality issues.
+    `name` is answers.name already stripped. Returns a DataQuality bitmask.
     """
-    dq: list[str] = []  # data quality warnings
-    notes: list[str] = []
+    flags = 0
 
-    name = answers.name.strip()
     if not name:
-        dq.append("Имя не заполнено — будет использован плейсхолдер.")
+        flags |= DataQuality.NAME_MISSING
 
     # Soft inconsistencies -> confidence penalty later
-    if answers.workouts_per_week == 0 and answers.activity_level in (
-        ActivityLevel.HIGH,
-        ActivityLevel.VERY_HIGH,
-    ):
-        dq.append("Несостыковка: высокий уровень активности при 0 тренировок/нед.")
-        notes.append("mismatch.activity_vs_workouts")
+    if answers.workouts_per_week == 0 and answers.activity_level in _HIGH_ACTIVITY:
+        flags |= DataQuality.MISMATCH_HIGH_NO_WORKOUTS
 
     if answers.workouts_per_week >= 6 and answers.activity_level == ActivityLevel.LOW:
-        dq.append("Несостыковка: низкий уровень активности при 6–7 тренировок/нед.")
-        notes.append("mismatch.activity_low_but_many_workouts")
+        flags |= DataQuality.MISMATCH_LOW_MANY_WORKOUTS
 
     if answers.water_liters == 0:
-        dq.append("Вода указана как 0 л — возможно, значение пропущено.")
-        notes.append("water.zero")
+        flags |= DataQuality.WATER_ZERO
 
     if answers.sleep_hours <= 4.5:
-        dq.append("Очень низкий сон — проверьте, что указано среднее значение.")
-        notes.append("sleep.very_low")
+        flags |= DataQuality.SLEEP_VERY_LOW
+
+    return flags
 
-    return dq, notes
+
+def data_quality_messages(flags: int) -> tuple[list[str], list[str]]:
+    """Data quality warnings and debug notes for a DataQuality bitmask"""
+    dq, notes = _DATA_QUALITY_RENDERED[flags]
+    return list(dq), list(notes)
+
+
+def validate(answers: SurveyAnswers, name: str) -> tuple[list[str], list[str]]:
+    """
+    Validate answers and return data quality warnings and notes.
+    `name` is answers.name already stripped.
+    Raises ValueError for hard validation errors.
+    """
+    return data_quality_messages(validate_flags(answers, name))
 
 
 # ---------- Helper Functions ----------
@@ -77,35 +187,88 @@ def clamp(value: int, lo: int, hi: int) -> int:
     return max(lo, min(hi, value))
 
 
-def append_unique(lst: list[str], item: str) -> list[str]:
-    """Append item to list if not already present"""
-    if item not in lst:
+def round_clamp(x: float) -> int:
+    """clamp(int(round(x)), 0, 100) in one call (round half to even)"""
+    v = round(x)
+    return 0 if v < 0 else 100 if v > 100 else v
+
+
+def append_unique(lst: list[str], seen: set[str], item: str) -> list[str]:
+    """Append item to list if not already present (seen mirrors lst)"""
+    if item not in seen:
+        seen.add(item)
         lst.append(item)
     return lst
 
 
 def trim_sentence(s: str) -> str:
     """Trim whitespace and ensure ends with period"""
-    s = s.strip().rstrip(".")
-    return s + "."
+    s = s.strip()
+    # Already ends with exactly one period (the usual case): nothing to do
+    if s.endswith(".") and not s.endswith(".."):
+        return s
+    return s.rstrip(".") + "."
+
+
+# (unix second, "YYYY-MM-DDTHH:MM:SS" for it) of the last utc_now_iso call;
+# replaced as one tuple so concurrent callers never see a mismatched pair
+_utc_second_prefix: tuple[int, str] = (-1, "")
+
+
+def utc_now_iso() -> str:
+    """
+    Current UTC time in datetime.isoformat() format.
+    The date/time part is formatted once per second; only the microseconds
+    are formatted per call.
+    """
+    global _utc_second_prefix
+
+    sec, us = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_sec, prefix = _utc_second_prefix
+    if sec != cached_sec:
+        prefix = datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _utc_second_prefix = (sec, prefix)
+    # isoformat() omits the fraction when it is zero
+    if us:
+        return f"{prefix}.{us:06d}+00:00"
+    return f"{prefix}+00:00"
 
 
 # ---------- Atomic Scoring Functions ----------
 
+# Base scores per enum value (built once, not per call; insights_batch
+# builds its lookup arrays from these tables)
+ACTIVITY_BASE = {
+    ActivityLevel.LOW: 25,
+    ActivityLevel.MEDIUM: 50,
+    ActivityLevel.HIGH: 70,
+    ActivityLevel.VERY_HIGH: 85,
+}
+
+NEAT_BASE = {
+    ActivityLevel.LOW: 30,
+    ActivityLevel.MEDIUM: 55,
+    ActivityLevel.HIGH: 70,
+    ActivityLevel.VERY_HIGH: 80,
+}
+
+FASTFOOD_SCORES = {
+    FastFoodFrequency.NEVER: 95,
+    FastFoodFrequency.RARELY: 80,
+    FastFoodFrequency.SOMETIMES: 60,
+    FastFoodFrequency.OFTEN: 35,
+    FastFoodFrequency.VERY_OFTEN: 15,
+}
+
+
 def score_activity(level: ActivityLevel, workouts: int) -> int:
     """Score activity based on level and workouts per week"""
-    base_scores = {
-        ActivityLevel.LOW: 25,
-        ActivityLevel.MEDIUM: 50,
-        ActivityLevel.HIGH: 70,
-        ActivityLevel.VERY_HIGH: 85,
-    }
-    base = base_scores.get(level, 50)
+    base = ACTIVITY_BASE.get(level, 50)
     bonus = clamp(workouts * 4, 0, 28)
 
     # Mismatch penalties
     mismatch = 0
-    if level in (ActivityLevel.VERY_HIGH, ActivityLevel.HIGH) and workouts <= 1:
+    if level in _HIGH_ACTIVITY and workouts <= 1:
         mismatch += 10
     if level == ActivityLevel.LOW and workouts >= 5:
         mismatch += 6
@@ -118,49 +281,63 @@ def score_neat(level: ActivityLevel, workouts: int) -> int:
     Score non-exercise activity thermogenesis (NEAT).
     Proxy for everyday movement beyond workouts.
     """
-    base_scores = {
-        ActivityLevel.LOW: 30,
-        ActivityLevel.MEDIUM: 55,
-        ActivityLevel.HIGH: 70,
-        ActivityLevel.VERY_HIGH: 80,
-    }
-    base = base_scores.get(level, 55)
+    base = NEAT_BASE.get(level, 55)
     bonus = clamp(workouts * 3, 0, 18)
     return clamp(base + bonus, 0, 100)
 
 
-def score_sleep(hours: float) -> int:
-    """Score sleep quality based on hours (optimal = 8)"""
+def _sleep_formula(hours: float) -> int:
+    """Sleep score formula (optimal = 8)"""
     opt = 8.0
     diff = abs(hours - opt)
     score = 100.0 - (diff * diff * 6.0)  # quadratic penalty
-    return clamp(int(round(score)), 0, 100)
+    return round_clamp(score)
 
 
-def score_stress(stress: int) -> int:
-    """Score stress (1=best -> 100, 10=worst -> 10)"""
+def _stress_formula(stress: int) -> int:
+    """Stress score formula"""
     score = 110 - stress * 10
     return clamp(score, 0, 100)
 
 
-def score_hydration(liters: float) -> int:
-    """Score hydration based on daily water intake"""
+def _hydration_formula(liters: float) -> int:
+    """Hydration score formula"""
     if liters <= 0:
         return 0
     score = 40 + liters * 24  # 2.5L -> 100
-    return clamp(int(round(score)), 0, 100)
+    return round_clamp(score)
+
+
+# Precomputed scores for the values the survey form produces (0.5 steps;
+# water is tabulated at 0.1 l). Keys are the exact floats those inputs
+# parse to; any other value falls back to the formula.
+_SLEEP_LUT = {h / 2: _sleep_formula(h / 2) for h in range(8, 25)}
+_HYDRATION_LUT = {w / 10: _hydration_formula(w / 10) for w in range(0, 51)}
+_STRESS_LUT = tuple(_stress_formula(s) for s in range(0, 11))
+
+
+def score_sleep(hours: float) -> int:
+    """Score sleep quality based on hours (optimal = 8)"""
+    score = _SLEEP_LUT.get(hours)
+    return _sleep_formula(hours) if score is None else score
+
+
+def score_stress(stress: int) -> int:
+    """Score stress (1=best -> 100, 10=worst -> 10)"""
+    if 0 <= stress <= 10:
+        return _STRESS_LUT[stress]
+    return _stress_formula(stress)
+
+
+def score_hydration(liters: float) -> int:
+    """Score hydration based on daily water intake"""
+    score = _HYDRATION_LUT.get(liters)
+    return _hydration_formula(liters) if score is None else score
 
 
 def score_nutrition(ff: FastFoodFrequency) -> int:
     """Score nutrition based on fast food frequency"""
-    scores = {
-        FastFoodFrequency.NEVER: 95,
-        FastFoodFrequency.RARELY: 80,
-        FastFoodFrequency.SOMETIMES: 60,
-        FastFoodFrequency.OFTEN: 35,
-        FastFoodFrequency.VERY_OFTEN: 15,
-    }
-    return scores.get(ff, 50)
+    return FASTFOOD_SCORES.get(ff, 50)
 
 
 def score_nutrition_stability(ff: FastFoodFrequency, stress: int) -> int:
@@ -182,14 +359,25 @@ def score_smoking(smokes: bool) -> int:
     return 20 if smokes else 90
 
 
+def _age_modifier_formula(age: int) -> int:
+    """Age modifier formula"""
+    t = (age - 18) / (80 - 18)  # 0..1
+    score = 95 - t * 40
+    return round_clamp(score)
+
+
+# Age modifier for every allowed age (18..80)
+_AGE_MODIFIER_LUT = tuple(_age_modifier_formula(age) for age in range(18, 81))
+
+
 def score_age_modifier(age: int) -> int:
     """
     Age modifier score.
     18 -> 95, 80 -> 55 (not medical!)
     """
-    t = (age - 18) / (80 - 18)  # 0..1
-    score = 95 - t * 40
-    return clamp(int(round(score)), 0, 100)
+    if 18 <= age <= 80:
+        return _AGE_MODIFIER_LUT[age - 18]
+    return _age_modifier_formula(age)
 
 
 def score_recovery_debt(sleep: float, stress: int, workouts: int) -> int:
@@ -210,7 +398,14 @@ def score_recovery_debt(sleep: float, stress: int, workouts: int) -> int:
     if workouts >= 5:
         debt += (workouts - 4) * 7.0
 
-    return clamp(int(round(debt)), 0, 100)
+    return round_clamp(debt)
+
+
+# Consistency adjustment per fast-food frequency
+FASTFOOD_CONSISTENCY = {
+    ff: -10 if ff in _FREQUENT_FASTFOOD else 6 if ff in _RARE_FASTFOOD else 0
+    for ff in FastFoodFrequency
+}
 
 
 def score_consistency(
@@ -241,10 +436,7 @@ def score_consistency(
         s -= 4
 
     # Fast food
-    if ff in (FastFoodFrequency.OFTEN, FastFoodFrequency.VERY_OFTEN):
-        s -= 10
-    elif ff in (FastFoodFrequency.NEVER, FastFoodFrequency.RARELY):
-        s += 6
+    s += FASTFOOD_CONSISTENCY[ff]
 
     # Water
     if water >= 1.8:
@@ -262,7 +454,7 @@ def score_readiness(
     r = 0.55 * recovery + 0.45 * energy
     r -= 0.20 * cardio_risk
     r -= 0.10 * metabolic_load
-    return clamp(int(round(r)), 0, 100)
+    return round_clamp(r)
 
 
 def balance_for_training_load(workouts: int) -> int:
@@ -279,19 +471,20 @@ def balance_for_training_load(workouts: int) -> int:
         return 70
 
 
-def score_confidence(answers: SurveyAnswers, dq: list[str]) -> int:
+def score_confidence(answers: SurveyAnswers, name: str, dq_len: int) -> int:
     """
     Confidence score based on data quality and odd combos.
-    Higher = more reliable output.
+    Higher = more reliable output. `name` is answers.name already stripped,
+    dq_len the number of data quality warnings.
     """
     c = 92
 
     # Missing name is minor
-    if not answers.name.strip():
+    if not name:
         c -= 2
 
     # Each DQ warning reduces confidence
-    c -= len(dq) * 6
+    c -= dq_len * 6
 
     # Extreme values reduce confidence
     if answers.sleep_hours <= 4.5 or answers.sleep_hours >= 11.5:
@@ -302,9 +495,23 @@ def score_confidence(answers: SurveyAnswers, dq: list[str]) -> int:
     return clamp(c, 40, 100)
 
 
+# Smoking risk indexed by the smokes bool (False, True)
+_SMOKING_RISK = (10, 90)
+
+
 def bool_to_risk(smokes: bool) -> int:
     """Convert smoking bool to risk value"""
-    return 90 if smokes else 10
+    return _SMOKING_RISK[smokes]
+
+
+def _age_risk_formula(age: int) -> int:
+    """Age risk formula"""
+    t = (age - 18) / (80 - 18)
+    return round_clamp(10 + t * 60)
+
+
+# Age risk for every allowed age (18..80)
+_AGE_RISK_LUT = tuple(_age_risk_formula(age) for age in range(18, 81))
 
 
 def age_risk(age: int) -> int:
@@ -312,23 +519,168 @@ def age_risk(age: int) -> int:
     Age-based risk factor.
     18 -> 10, 80 -> 70 (not medical!)
     """
-    t = (age - 18) / (80 - 18)
-    return clamp(int(round(10 + t * 60)), 0, 100)
+    if 18 <= age <= 80:
+        return _AGE_RISK_LUT[age - 18]
+    return _age_risk_formula(age)
 
 
 # ---------- Weighted Average ----------
 
+# Health index weights (proprietary, tunable)
+HEALTH_WEIGHTS = {
+    "activity": 20,
+    "sleep": 20,
+    "stress": 18,
+    "hydration": 10,
+    "nutrition": 18,
+    "smoking": 10,
+    "age": 4,
+}
+
+# Same weights as a tuple in HEALTH_WEIGHTS key order, plus their sum
+_HEALTH_WEIGHT_VALUES = tuple(HEALTH_WEIGHTS.values())
+_HEALTH_WEIGHT_SUM = sum(_HEALTH_WEIGHT_VALUES)
+
+
+def round_div(num: int, den: int) -> int:
+    """
+    Integer equivalent of int(round(num / den)) for den > 0.
+    Ties round to even, like round().
+    """
+    q, r = divmod(num, den)
+    if 2 * r > den or (2 * r == den and q & 1):
+        q += 1
+    return q
+
+
 def weighted_average(sub: dict[str, int], weights: dict[str, int]) -> int:
     """Calculate weighted average of subscores"""
     sum_w = sum(weights.values())
     if sum_w == 0:
         return 0
     total = sum(sub[k] * w for k, w in weights.items())
-    return clamp(int(round(total / sum_w)), 0, 100)
+    return clamp(round_div(total, sum_w), 0, 100)
+
+
+def health_index(sub: tuple[int, ...]) -> int:
+    """
+    Health index from subscores given in HEALTH_WEIGHTS key order.
+    Same result as weighted_average(sub_dict, HEALTH_WEIGHTS).
+    """
+    a, s, st, h, n, sm, ag = sub
+    w0, w1, w2, w3, w4, w5, w6 = _HEALTH_WEIGHT_VALUES
+    total = a * w0 + s * w1 + st * w2 + h * w3 + n * w4 + sm * w5 + ag * w6
+    return clamp(round_div(total, _HEALTH_WEIGHT_SUM), 0, 100)
+
+
+# Composite indices as (component, weight) terms. Terms are summed in the
+# listed order: float addition isn't associative, so reordering (or a
+# matmul) can flip results that land near .5.
+COMPOSITE_WEIGHTS = {
+    "recovery": (
+        ("sleep", 0.55),
+        ("stress", 0.30),
+        ("training_balance", 0.15),
+    ),
+    "lifestyle": (
+        ("sleep", 0.22),
+        ("stress", 0.22),
+        ("nutrition", 0.20),
+        ("hydration", 0.18),
+        ("neat", 0.18),
+    ),
+    "energy": (
+        ("sleep", 0.40),
+        ("stress", 0.35),
+        ("hydration", 0.25),
+    ),
+    "metabolic_load": (
+        ("nutrition_gap", 0.45),
+        ("activity_gap", 0.25),
+        ("sleep_gap", 0.15),
+        ("hydration_gap", 0.15),
+    ),
+    "cardio_risk": (
+        ("smoking_risk", 0.45),
+        ("activity_gap", 0.20),
+        ("age_risk", 0.20),
+        ("sleep_gap", 0.15),
+    ),
+    # Share of the good/needs-work donut
+    "good": (
+        ("health", 0.30),
+        ("recovery", 0.20),
+        ("lifestyle", 0.20),
+        ("energy", 0.15),
+        ("consistency", 0.15),
+    ),
+}
+
+
+# HEALTH_WEIGHTS / COMPOSITE_WEIGHTS as arrays for the Numba kernel
+_KERNEL_WEIGHTS = pack_weights(HEALTH_WEIGHTS, COMPOSITE_WEIGHTS)
+
+
+def linear_score(terms: tuple[tuple[str, float], ...], components: dict) -> int:
+    """Weighted sum of components (in term order), rounded and clamped to 0..100"""
+    total = 0.0
+    for key, weight in terms:
+        total += weight * components[key]
+    return round_clamp(total)
 
 
 # ---------- Chart Builders ----------
 
+# (key, label) of each percentile point, in output order
+PERCENTILE_POINTS = (
+    ("health_pct", "Индекс здоровья (перцентиль)"),
+    ("activity_pct", "Активность (перцентиль)"),
+    ("recovery_pct", "Восстановление (перцентиль)"),
+    ("balance_pct", "Баланс (перцентиль)"),
+    ("risk_pct", "Кардио-риск (перцентиль ниже = лучше)"),
+)
+
+# (key, label) of each risk composition slice, in output order
+RISK_POINTS = (
+    ("smoking_risk", LABEL_SMOKING),
+    ("sleep_risk", LABEL_SLEEP),
+    ("stress_risk", LABEL_STRESS),
+    ("activity_risk", LABEL_ACTIVITY),
+    ("nutrition_risk", LABEL_NUTRITION),
+)
+
+# (key, label) of each radar point, in output order
+RADAR_POINTS = (
+    ("activity", LABEL_ACTIVITY),
+    ("neat", LABEL_NEAT),
+    ("sleep", LABEL_SLEEP),
+    ("stress", LABEL_STRESS),
+    ("hydration", LABEL_HYDRATION),
+    ("nutrition", LABEL_NUTRITION),
+    ("habits", LABEL_HABITS),
+)
+
+# (key, label) of each dimension bar, in output order
+DIMENSION_POINTS = (
+    ("activity", LABEL_ACTIVITY),
+    ("sleep", LABEL_SLEEP),
+    ("stress", LABEL_STRESS),
+    ("hydration", LABEL_HYDRATION),
+    ("nutrition", LABEL_NUTRITION),
+    ("habits", LABEL_HABITS),
+)
+
+
+def chart_points(
+    spec: tuple[tuple[str, str], ...], values: Sequence[int]
+) -> list[ChartPoint]:
+    """Pair (key, label) specs with values"""
+    return [
+        ChartPoint(key=key, label=label, value=value)
+        for (key, label), value in zip(spec, values)
+    ]
+
+
 def build_percentiles(
     health: int, activity: int, recovery: int, lifestyle: int, cardio_risk: int
 ) -> list[ChartPoint]:
@@ -336,37 +688,20 @@ def build_percentiles(
     Build percentile-like UI numbers.
     Heuristic mapping (not medical).
     """
-    return [
-        ChartPoint(
-            key="health_pct",
-            label="Индекс здоровья (перцентиль)",
-            value=clamp(int(round(health * 0.9 + 10)), 0, 100),
-        ),
-        ChartPoint(
-            key="activity_pct",
-            label="Активность (перцентиль)",
-            value=clamp(int(round(activity * 0.95 + 5)), 0, 100),
-        ),
-        ChartPoint(
-            key="recovery_pct",
-            label="Восстановление (перцентиль)",
-            value=clamp(int(round(recovery * 0.9 + 10)), 0, 100),
-        ),
-        ChartPoint(
-            key="balance_pct",
-            label="Баланс (перцентиль)",
-            value=clamp(int(round(lifestyle * 0.9 + 10)), 0, 100),
-        ),
-        ChartPoint(
-            key="risk_pct",
-            label="Кардио-риск (перцентиль ниже = лучше)",
-            value=clamp(100 - cardio_risk, 0, 100),
-        ),
-    ]
+    return chart_points(
+        PERCENTILE_POINTS,
+        [
+            round_clamp(health * 0.9 + 10),
+            round_clamp(activity * 0.95 + 5),
+            round_clamp(recovery * 0.9 + 10),
+            round_clamp(lifestyle * 0.9 + 10),
+            clamp(100 - cardio_risk, 0, 100),
+        ],
+    )
 
 
-def next_tier(v: int) -> int:
-    """Get next tier target value"""
+def _next_tier_value(v: int) -> int:
+    """Next tier target value (threshold logic)"""
     if v < 40:
         return 55
     elif v < 55:
@@ -377,46 +712,41 @@ def next_tier(v: int) -> int:
         return 90
 
 
-def build_targets(
-    sub: dict[str, int], neat: int, habit_score: int, recovery_debt: int, workouts: int
-) -> list[Target]:
-    """Build progress target suggestions"""
-    targets: list[Target] = []
-
-    def add(key: str, label: str, current: int, next_val: int, suggested: str):
-        if current < next_val:
-            targets.append(
-                Target(
-                    key=key,
-                    label=label,
-                    current=current,
-                    next_tier=next_val,
-                    suggested=suggested,
-                )
-            )
+# next_tier for every score in 0..100
+_NEXT_TIER = tuple(_next_tier_value(v) for v in range(101))
 
-    add(
-        "sleep",
-        "Сон",
-        sub["sleep"],
-        next_tier(sub["sleep"]),
-        "Добавьте +30 минут ко сну и зафиксируйте подъём.",
-    )
-    add(
-        "hydration",
-        "Вода",
-        sub["hydration"],
-        next_tier(sub["hydration"]),
-        "Добавьте +0.5 л/день (постепенно).",
-    )
-    add(
+
+def next_tier(v: int) -> int:
+    """Get next tier target value"""
+    if 0 <= v <= 100:
+        return _NEXT_TIER[v]
+    return _next_tier_value(v)
+
+
+# (key, label, suggestion) per target; None = activity suggestion chosen
+# from the current workout count
+_TARGET_SPECS = (
+    ("sleep", LABEL_SLEEP, "Добавьте +30 минут ко сну и зафиксируйте подъём."),
+    ("hydration", LABEL_HYDRATION, "Добавьте +0.5 л/день (постепенно)."),
+    (
         "nutrition",
-        "Питание",
-        sub["nutrition"],
-        next_tier(sub["nutrition"]),
+        LABEL_NUTRITION,
         "Снизьте фастфуд на 1 шаг и сделайте 1 «якорный» приём пищи.",
-    )
+    ),
+    ("activity", LABEL_ACTIVITY, None),
+    (
+        "neat",
+        LABEL_NEAT,
+        "Поставьте цель по шагам и делайте 2 короткие прогулки в день.",
+    ),
+    ("habits", LABEL_HABITS, "Вода + меньше фастфуда + (если нужно) снижение курения."),
+)
+
 
+def build_targets(
+    sub: dict[str, int], neat: int, habit_score: int, recovery_debt: int, workouts: int
+) -> list[Target]:
+    """Build progress target suggestions"""
     # Dynamic activity suggestion based on current workouts
     if workouts >= 3:
         activity_suggestion = "Добавьте шаги или повысьте интенсивность тренировок."
@@ -425,27 +755,25 @@ def build_targets(
     else:
         activity_suggestion = "Начните с 2–3 тренировок в неделю или добавьте шаги."
 
-    add(
-        "activity",
-        "Активность",
-        sub["activity"],
-        next_tier(sub["activity"]),
-        activity_suggestion,
-    )
-    add(
-        "neat",
-        "Движение (NEAT)",
-        neat,
-        next_tier(neat),
-        "Поставьте цель по шагам и делайте 2 короткие прогулки в день.",
-    )
-    add(
-        "habits",
-        "Привычки",
-        habit_score,
-        next_tier(habit_score),
-        "Вода + меньше фастфуда + (если нужно) снижение курения.",
-    )
+    current = {
+        "sleep": sub["sleep"],
+        "hydration": sub["hydration"],
+        "nutrition": sub["nutrition"],
+        "activity": sub["activity"],
+        "neat": neat,
+        "habits": habit_score,
+    }
+    targets = [
+        Target(
+            key=key,
+            label=label,
+            current=value,
+            next_tier=tier,
+            suggested=suggested or activity_suggestion,
+        )
+        for key, label, suggested in _TARGET_SPECS
+        if (value := current[key]) < (tier := next_tier(value))
+    ]
 
     # Recovery debt is inverse: lower is better
     if recovery_debt > 35:
@@ -462,31 +790,45 @@ def build_targets(
     return targets
 
 
+def normalize_values_to_100(values: Sequence[int]) -> list[int]:
+    """
+    Scale values to percentages summing to 100 (for pie/stacked charts).
+    Values summing to 0 are returned unchanged.
+    """
+    clipped = [v if v > 0 else 0 for v in values]
+    total = sum(clipped)
+    if total == 0:
+        return list(values)
+
+    result = [int(round(v * 100.0 / total)) for v in clipped[:-1]]
+    # Last slice absorbs rounding so the total is 100
+    result.append(100 - sum(result))
+    return [clamp(pct, 0, 100) for pct in result]
+
+
 def normalize_to_100(points: list[ChartPoint]) -> list[ChartPoint]:
     """Normalize list of values to sum to 100 (for pie/stacked charts)"""
     total = sum(max(0, p.value) for p in points)
     if total == 0:
         return points
 
-    result: list[ChartPoint] = []
-    acc = 0
-    for i, p in enumerate(points):
-        v = max(0, p.value)
-        pct = int(round(v * 100.0 / total))
-        # Ensure sums to 100
-        if i == len(points) - 1:
-            pct = 100 - acc
-        else:
-            acc += pct
-        result.append(
-            ChartPoint(key=p.key, label=p.label, value=clamp(pct, 0, 100))
-        )
-
-    return result
+    return [
+        ChartPoint(key=p.key, label=p.label, value=value)
+        for p, value in zip(points, normalize_values_to_100([p.value for p in points]))
+    ]
 
 
 # ---------- Text Builders ----------
 
+# Goal-tailored improvement hint
+_GOAL_HINTS = {
+    Goal.FAT_LOSS: "Для похудения ключ — стабильность: сон + питание + шаги.",
+    Goal.MASS_GAIN: "Для набора массы: 3 силовые/нед и приоритет восстановления.",
+    Goal.MAINTAIN: "Для поддержания формы: удерживать привычки важнее, чем «идеально» тренироваться.",
+    Goal.HEALTH: "Для здоровья: сон/вода/движение — самые быстрые рычаги.",
+}
+
+
 def build_strengths_and_improvements(
     answers: SurveyAnswers,
     sub: dict[str, int],
@@ -533,34 +875,29 @@ def build_strengths_and_improvements(
     strengths: list[str] = []
     improvements: list[str] = []
 
-    # Pick top 3 highs
-    sorted_high = sorted(items, key=lambda x: x[0], reverse=True)
-    for val, hi, _ in sorted_high[:3]:
+    # Pick top 3 highs (nlargest/nsmallest keep sorted()'s tie order)
+    for val, hi, _ in heapq.nlargest(3, items, key=itemgetter(0)):
         if val >= 72:
             strengths.append(hi)
 
     # Pick bottom 3 lows
-    sorted_low = sorted(items, key=lambda x: x[0])
-    for val, _, lo in sorted_low[:3]:
+    for val, _, lo in heapq.nsmallest(3, items, key=itemgetter(0)):
         if val <= 58:
             improvements.append(lo)
+    seen_improvements = set(improvements)
 
     # Recovery debt explicit
     if recovery_debt >= 60:
         improvements = append_unique(
             improvements,
+            seen_improvements,
             "Сначала закройте «долг восстановления» (сон/стресс/нагрузка), потом ускоряйте прогресс.",
         )
 
     # Goal-tailored hint
-    goal_hints = {
-        Goal.FAT_LOSS: "Для похудения ключ — стабильность: сон + питание + шаги.",
-        Goal.MASS_GAIN: "Для набора массы: 3 силовые/нед и приоритет восстановления.",
-        Goal.MAINTAIN: "Для поддержания формы: удерживать привычки важнее, чем «идеально» тренироваться.",
-        Goal.HEALTH: "Для здоровья: сон/вода/движение — самые быстрые рычаги.",
-    }
-    if answers.goal in goal_hints:
-        improvements = append_unique(improvements, goal_hints[answers.goal])
+    goal_hint = _GOAL_HINTS.get(answers.goal)
+    if goal_hint is not None:
+        improvements = append_unique(improvements, seen_improvements, goal_hint)
 
     return strengths, improvements
 
@@ -581,6 +918,11 @@ def persona_tag(
         return "Умеренный баланс"
 
 
+def summary_greeting(name: str) -> str:
+    """Opening of the summary text - the only part that depends on the name"""
+    return f"Привет, {name}! "
+
+
 def build_summary_text(
     name: str,
     answers: SurveyAnswers,
@@ -590,7 +932,8 @@ def build_summary_text(
 ) -> str:
     """Build summary text paragraph"""
     parts = [
-        f"Привет, {name}! Индекс здоровья — {gauges.health_index}/100; "
+        summary_greeting(name),
+        f"Индекс здоровья — {gauges.health_index}/100; "
         f"готовность — {gauges.readiness}/100; "
         f"уверенность расчёта — {gauges.confidence}/100. "
     ]
@@ -610,6 +953,64 @@ def build_summary_text(
 
 # ---------- Flags and Alerts ----------
 
+# Alerts have no per-user text, so each is built once and shared
+_ALERT_SMOKING = Alert(
+    key="smoking",
+    severity="high",
+    title="Фактор риска: курение",
+    body="Даже сокращение количества сигарет улучшает метрики восстановления и кардио-риска.",
+)
+
+_ALERT_SLEEP_LOW = Alert(
+    key="sleep_low",
+    severity="high",
+    title="Критически мало сна",
+    body="Попробуйте добавить хотя бы +30 минут сна в течение ближайшей недели.",
+)
+
+_ALERT_STRESS_HIGH = Alert(
+    key="stress_high",
+    severity="warn",
+    title="Высокий стресс",
+    body="Паузы/прогулки/дыхание по 5 минут 2 раза в день уже дают эффект на самочувствие.",
+)
+
+_ALERT_WATER_LOW = Alert(
+    key="water_low",
+    severity="info",
+    title="Низкое потребление воды",
+    body="Поднимайте объём постепенно: +0.3–0.5 л/день.",
+)
+
+_ALERT_RECOVERY_DEBT = Alert(
+    key="recovery_debt",
+    severity="warn",
+    title="Накоплен долг восстановления",
+    body="Сон/стресс/нагрузка сейчас складываются в риск перетренированности или отката.",
+)
+
+_ALERT_CARDIO_RISK = Alert(
+    key="cardio_risk",
+    severity="warn",
+    title="Повышенный кардио-риск (по анкете)",
+    body="Это не диагноз. Улучшайте сон и активность, а при жалобах — консультируйтесь с врачом.",
+)
+
+_ALERT_METABOLIC_LOAD = Alert(
+    key="metabolic_load",
+    severity="info",
+    title="Высокая метаболическая нагрузка",
+    body="Чаще всего улучшается через питание (реже фастфуд) и регулярное движение.",
+)
+
+_ALERT_GREEN_ZONE = Alert(
+    key="green_zone",
+    severity="info",
+    title="Вы в «зелёной зоне»",
+    body="Сейчас лучшее — закрепить привычки и улучшать показатели точечно.",
+)
+
+
 def build_flags_and_alerts(
     answers: SurveyAnswers,
     sub: dict[str, int],
@@ -624,84 +1025,32 @@ def build_flags_and_alerts(
 
     if answers.smokes:
         risk_flags.append("Курение: снижает выносливость и общий индекс здоровья.")
-        alerts.append(
-            Alert(
-                key="smoking",
-                severity="high",
-                title="Фактор риска: курение",
-                body="Даже сокращение количества сигарет улучшает метрики восстановления и кардио-риска.",
-            )
-        )
+        alerts.append(_ALERT_SMOKING)
 
     if answers.sleep_hours < 6.0:
         risk_flags.append("Сон < 6 часов: восстановление и энергия вероятно проседают.")
-        alerts.append(
-            Alert(
-                key="sleep_low",
-                severity="high",
-                title="Критически мало сна",
-                body="Попробуйте добавить хотя бы +30 минут сна в течение ближайшей недели.",
-            )
-        )
+        alerts.append(_ALERT_SLEEP_LOW)
 
     if answers.stress_level >= 8:
         risk_flags.append("Стресс 8–10: риск выгорания и срывов режима.")
-        alerts.append(
-            Alert(
-                key="stress_high",
-                severity="warn",
-                title="Высокий стресс",
-                body="Паузы/прогулки/дыхание по 5 минут 2 раза в день уже дают эффект на самочувствие.",
-            )
-        )
+        alerts.append(_ALERT_STRESS_HIGH)
 
     if answers.water_liters < 1.2:
         risk_flags.append("Вода < 1.2 л: возможны скачки аппетита и усталость.")
-        alerts.append(
-            Alert(
-                key="water_low",
-                severity="info",
-                title="Низкое потребление воды",
-                body="Поднимайте объём постепенно: +0.3–0.5 л/день.",
-            )
-        )
+        alerts.append(_ALERT_WATER_LOW)
 
-    if answers.fastfood_frequency in (
-        FastFoodFrequency.OFTEN,
-        FastFoodFrequency.VERY_OFTEN,
-    ):
+    if answers.fastfood_frequency in _FREQUENT_FASTFOOD:
         risk_flags.append("Фастфуд часто: нагрузка на метаболический профиль выше.")
 
     # Derived alerts
     if recovery_debt >= 60:
-        alerts.append(
-            Alert(
-                key="recovery_debt",
-                severity="warn",
-                title="Накоплен долг восстановления",
-                body="Сон/стресс/нагрузка сейчас складываются в риск перетренированности или отката.",
-            )
-        )
+        alerts.append(_ALERT_RECOVERY_DEBT)
 
     if cardio_risk >= 65:
-        alerts.append(
-            Alert(
-                key="cardio_risk",
-                severity="warn",
-                title="Повышенный кардио-риск (по анкете)",
-                body="Это не диагноз. Улучшайте сон и активность, а при жалобах — консультируйтесь с врачом.",
-            )
-        )
+        alerts.append(_ALERT_CARDIO_RISK)
 
     if metabolic_load >= 70:
-        alerts.append(
-            Alert(
-                key="metabolic_load",
-                severity="info",
-                title="Высокая метаболическая нагрузка",
-                body="Чаще всего улучшается через питание (реже фастфуд) и регулярное движение.",
-            )
-        )
+        alerts.append(_ALERT_METABOLIC_LOAD)
 
     # If everything is fine: positive info
     if (
@@ -710,20 +1059,257 @@ def build_flags_and_alerts(
         and sub["nutrition"] >= 70
         and sub["stress"] >= 65
     ):
-        alerts.append(
-            Alert(
-                key="green_zone",
-                severity="info",
-                title="Вы в «зелёной зоне»",
-                body="Сейчас лучшее — закрепить привычки и улучшать показатели точечно.",
-            )
-        )
+        alerts.append(_ALERT_GREEN_ZONE)
 
     return Flags(risk_flags=risk_flags, data_quality=dq, alerts=alerts)
 
 
 # ---------- Recommendations ----------
 
+def _tier_value(v: int) -> str:
+    """Coarse score tier used by recommendation rules"""
+    if v >= 80:
+        return "high"
+    elif v >= 60:
+        return "mid"
+    else:
+        return "low"
+
+
+# _tier for every score in 0..100
+_TIER = tuple(_tier_value(v) for v in range(101))
+
+
+def _tier(v: int) -> str:
+    """Coarse score tier (table lookup for 0..100)"""
+    if 0 <= v <= 100:
+        return _TIER[v]
+    return _tier_value(v)
+
+
+@dataclass(slots=True)
+class RecContext:
+    """Inputs available to recommendation rules"""
+    answers: SurveyAnswers
+    sub: dict[str, int]
+    cardio_risk: int
+    recovery_debt: int
+    confidence: int
+
+
+class RecRule(NamedTuple):
+    """
+    A recommendation emitted when predicate(ctx) holds.
+    Rules with a goal only apply to surveys with that goal.
+    """
+    predicate: Callable[[RecContext], bool]
+    factory: Callable[[RecContext], Recommendation]
+    goal: Optional[Goal] = None
+
+
+def _rec(
+    key: str, title: str, why: str, next_step: str, priority: int, category: str
+) -> Callable[[RecContext], Recommendation]:
+    """
+    Factory for a rule's Recommendation.
+    `why` is a str.format template over sub (subscores) and cardio_risk;
+    recommendations without placeholders are built once and shared.
+    """
+    if "{" not in why:
+        rec = Recommendation(
+            key=key,
+            title=title,
+            why=why,
+            next_step=next_step,
+            priority=priority,
+            category=category,
+        )
+        return lambda ctx: rec
+
+    def factory(ctx: RecContext) -> Recommendation:
+        return Recommendation(
+            key=key,
+            title=title,
+            why=why.format(sub=ctx.sub, cardio_risk=ctx.cardio_risk),
+            next_step=next_step,
+            priority=priority,
+            category=category,
+        )
+
+    return factory
+
+
+# Evaluated in order; duplicates by key are resolved in build_recommendations
+_REC_RULES: tuple[RecRule, ...] = (
+    # Sleep
+    RecRule(
+        lambda c: _tier(c.sub["sleep"]) != "high",
+        _rec(
+            "sleep_upgrade",
+            "Улучшить сон (первый рычаг)",
+            "Сон {sub[sleep]}/100 — он сильнее всего влияет на восстановление и энергию.",
+            "План на 7 дней: фиксированный подъём + уберите экран за 45 минут до сна.",
+            88,
+            "sleep",
+        ),
+    ),
+    # Stress
+    RecRule(
+        lambda c: _tier(c.sub["stress"]) == "low" or c.answers.stress_level >= 7,
+        _rec(
+            "stress_protocol",
+            "Протокол снижения стресса",
+            "Стресс напрямую снижает качество восстановления и повышает вероятность срывов.",
+            "2× в день по 5 минут: прогулка/дыхание + один «безэкранный» слот вечером.",
+            82,
+            "stress",
+        ),
+    ),
+    # Hydration
+    RecRule(
+        lambda c: c.sub["hydration"] < 70,
+        _rec(
+            "water_routine",
+            "Сделать воду автоматической привычкой",
+            "Вода {sub[hydration]}/100 — это простой и быстрый апгрейд самочувствия.",
+            "Поставьте бутылку 0.5 л на рабочий стол и выпивайте 2 такие до 16:00.",
+            62,
+            "hydration",
+        ),
+    ),
+    # Nutrition
+    RecRule(
+        lambda c: c.sub["nutrition"] < 70,
+        _rec(
+            "nutrition_anchor",
+            "Якорный приём пищи",
+            "Стабильный один приём в день резко улучшает общий рацион без силы воли.",
+            "Ежедневно: белок + овощи + сложные углеводы (или фрукты) — в одном приёме.",
+            74,
+            "nutrition",
+        ),
+    ),
+    RecRule(
+        lambda c: c.answers.fastfood_frequency in _FREQUENT_FASTFOOD,
+        _rec(
+            "fastfood_stepdown",
+            "Снизить фастфуд на один шаг",
+            "Частый фастфуд повышает метаболическую нагрузку.",
+            "На ближайшие 14 дней: замените 1 фастфуд-приём на альтернативу (bowl/суп/салат+белок).",
+            79,
+            "nutrition",
+        ),
+    ),
+    # Smoking
+    RecRule(
+        lambda c: c.answers.smokes,
+        _rec(
+            "smoking_reduce",
+            "Сократить курение",
+            "Кардио-риск {cardio_risk}/100 частично формируется привычками.",
+            "Выберите шаг: минус 1 сиг/день или «окна без курения» до обеда.",
+            92,
+            "habits",
+        ),
+    ),
+    # Activity
+    RecRule(
+        lambda c: c.answers.workouts_per_week <= 1,
+        _rec(
+            "workouts_2x",
+            "Минимум эффективности: 2 тренировки/нед",
+            "С 2 тренировками прогресс становится предсказуемым.",
+            "2× по 35–45 минут: базовые упражнения на всё тело + прогулки в остальные дни.",
+            77,
+            "activity",
+        ),
+    ),
+    RecRule(
+        lambda c: c.answers.workouts_per_week >= 6
+        and (
+            c.recovery_debt >= 55
+            or c.answers.sleep_hours < 7
+            or c.answers.stress_level >= 7
+        ),
+        _rec(
+            "deload_week",
+            "Неделя разгрузки",
+            "Много тренировок на фоне сна/стресса часто накапливает долг восстановления.",
+            "1–2 дня замените на лёгкую активность: 30–45 мин ходьбы/мобилити.",
+            73,
+            "recovery",
+        ),
+    ),
+    # Goal extras - contextual based on current activity level
+    RecRule(
+        lambda c: c.answers.workouts_per_week >= 4,
+        _rec(
+            "steps_goal",
+            "Добавить низкоинтенсивное кардио",
+            "При высокой частоте тренировок шаги/прогулки помогают сжигать калории без перегрузки.",
+            "Добавьте 20–30 мин ходьбы в дни отдыха или после силовых.",
+            58,
+            "activity",
+        ),
+        goal=Goal.FAT_LOSS,
+    ),
+    RecRule(
+        lambda c: c.answers.workouts_per_week < 4,
+        _rec(
+            "steps_goal",
+            "Добавить шаги",
+            "Шаги увеличивают расход энергии без сильной нагрузки на восстановление.",
+            "Цель на 10 дней: +2000 шагов к текущему уровню (или 7000–9000/день).",
+            58,
+            "activity",
+        ),
+        goal=Goal.FAT_LOSS,
+    ),
+    RecRule(
+        lambda c: c.answers.workouts_per_week >= 3,
+        _rec(
+            "strength_plan",
+            "Прогрессия нагрузки",
+            "Для набора массы важна прогрессия: постепенно увеличивайте веса/объём.",
+            "Ведите дневник тренировок: фиксируйте веса и повторы, добавляйте понемногу.",
+            60,
+            "activity",
+        ),
+        goal=Goal.MASS_GAIN,
+    ),
+    RecRule(
+        lambda c: c.answers.workouts_per_week < 3,
+        _rec(
+            "strength_plan",
+            "Силовой план с прогрессией",
+            "Для набора массы нужны минимум 3 силовые тренировки в неделю.",
+            "3×/нед: жим/тяга/присед (вариации) + ведите веса/повторы.",
+            60,
+            "activity",
+        ),
+        goal=Goal.MASS_GAIN,
+    ),
+    # Low confidence meta-rec
+    RecRule(
+        lambda c: c.confidence < 70,
+        _rec(
+            "data_check",
+            "Уточнить ответы анкеты",
+            "Есть несостыковки/крайние значения — это снижает точность рекомендаций.",
+            "Проверьте сон/воду/тренировки и заполните заново — дашборд станет точнее.",
+            50,
+            "meta",
+        ),
+    ),
+)
+
+# Rules specialized per goal: the goal check is resolved once, at import
+_REC_RULES_BY_GOAL = {
+    goal: tuple(rule for rule in _REC_RULES if rule.goal in (None, goal))
+    for goal in Goal
+}
+
+
 def build_recommendations(
     answers: SurveyAnswers,
     sub: dict[str, int],
@@ -736,367 +1322,325 @@ def build_recommendations(
     confidence: int,
 ) -> list[Recommendation]:
     """Build personalized recommendations"""
-    recs: list[Recommendation] = []
-
-    def tier(v: int) -> str:
-        if v >= 80:
-            return "high"
-        elif v >= 60:
-            return "mid"
-        else:
-            return "low"
-
-    # Sleep
-    if tier(sub["sleep"]) != "high":
-        recs.append(
-            Recommendation(
-                key="sleep_upgrade",
-                title="Улучшить сон (первый рычаг)",
-                why=f"Сон {sub['sleep']}/100 — он сильнее всего влияет на восстановление и энергию.",
-                next_step="План на 7 дней: фиксированный подъём + уберите экран за 45 минут до сна.",
-                priority=88,
-                category="sleep",
-            )
-        )
+    ctx = RecContext(answers, sub, cardio_risk, recovery_debt, confidence)
+    rules = _REC_RULES_BY_GOAL[answers.goal]
+    recs = [rule.factory(ctx) for rule in rules if rule.predicate(ctx)]
 
-    # Stress
-    if tier(sub["stress"]) == "low" or answers.stress_level >= 7:
-        recs.append(
-            Recommendation(
-                key="stress_protocol",
-                title="Протокол снижения стресса",
-                why="Стресс напрямую снижает качество восстановления и повышает вероятность срывов.",
-                next_step="2× в день по 5 минут: прогулка/дыхание + один «безэкранный» слот вечером.",
-                priority=82,
-                category="stress",
-            )
-        )
-
-    # Hydration
-    if sub["hydration"] < 70:
-        recs.append(
-            Recommendation(
-                key="water_routine",
-                title="Сделать воду автоматической привычкой",
-                why=f"Вода {sub['hydration']}/100 — это простой и быстрый апгрейд самочувствия.",
-                next_step="Поставьте бутылку 0.5 л на рабочий стол и выпивайте 2 такие до 16:00.",
-                priority=62,
-                category="hydration",
-            )
-        )
+    # Dedupe by key, keeping the highest-priority (then earliest) rec
+    best: dict[str, tuple[int, Recommendation]] = {}
+    for i, r in enumerate(recs):
+        if r.key and (r.key not in best or r.priority > best[r.key][1].priority):
+            best[r.key] = (i, r)
 
-    # Nutrition
-    if sub["nutrition"] < 70:
-        recs.append(
-            Recommendation(
-                key="nutrition_anchor",
-                title="Якорный приём пищи",
-                why="Стабильный один приём в день резко улучшает общий рацион без силы воли.",
-                next_step="Ежедневно: белок + овощи + сложные углеводы (или фрукты) — в одном приёме.",
-                priority=74,
-                category="nutrition",
-            )
-        )
+    # Sort by priority descending (ties keep insertion order)
+    ranked = sorted(best.values(), key=lambda x: (-x[1].priority, x[0]))
+    return [r for _, r in ranked]
 
-    if answers.fastfood_frequency in (
-        FastFoodFrequency.OFTEN,
-        FastFoodFrequency.VERY_OFTEN,
-    ):
-        recs.append(
-            Recommendation(
-                key="fastfood_stepdown",
-                title="Снизить фастфуд на один шаг",
-                why="Частый фастфуд повышает метаболическую нагрузку.",
-                next_step="На ближайшие 14 дней: замените 1 фастфуд-приём на альтернативу (bowl/суп/салат+белок).",
-                priority=79,
-                category="nutrition",
-            )
-        )
 
-    # Smoking
-    if answers.smokes:
-        recs.append(
-            Recommendation(
-                key="smoking_reduce",
-                title="Сократить курение",
-                why=f"Кардио-риск {cardio_risk}/100 частично формируется привычками.",
-                next_step="Выберите шаг: минус 1 сиг/день или «окна без курения» до обеда.",
-                priority=92,
-                category="habits",
-            )
-        )
+# ---------- Main Function ----------
 
-    # Activity
-    if answers.workouts_per_week <= 1:
-        recs.append(
-            Recommendation(
-                key="workouts_2x",
-                title="Минимум эффективности: 2 тренировки/нед",
-                why="С 2 тренировками прогресс становится предсказуемым.",
-                next_step="2× по 35–45 минут: базовые упражнения на всё тело + прогулки в остальные дни.",
-                priority=77,
-                category="activity",
-            )
-        )
-    elif answers.workouts_per_week >= 6 and (
-        recovery_debt >= 55 or answers.sleep_hours < 7 or answers.stress_level >= 7
-    ):
-        recs.append(
-            Recommendation(
-                key="deload_week",
-                title="Неделя разгрузки",
-                why="Много тренировок на фоне сна/стресса часто накапливает долг восстановления.",
-                next_step="1–2 дня замените на лёгкую активность: 30–45 мин ходьбы/мобилити.",
-                priority=73,
-                category="recovery",
-            )
-        )
+def compute_scores(answers: SurveyAnswers) -> tuple[int, ...]:
+    """
+    Compute all numeric scores (pure-Python path).
+    Returns values in _scoring_numba.SCORE_FIELDS order.
+    """
+    level, workouts, sleep_h, stress_lvl, water, ff, smokes, age = _score_inputs(answers)
 
-    # Goal extras - contextual based on current activity level
-    if answers.goal == Goal.FAT_LOSS:
-        if answers.workouts_per_week >= 4:
-            recs.append(
-                Recommendation(
-                    key="steps_goal",
-                    title="Добавить низкоинтенсивное кардио",
-                    why="При высокой частоте тренировок шаги/прогулки помогают сжигать калории без перегрузки.",
-                    next_step="Добавьте 20–30 мин ходьбы в дни отдыха или после силовых.",
-                    priority=58,
-                    category="activity",
-                )
-            )
-        else:
-            recs.append(
-                Recommendation(
-                    key="steps_goal",
-                    title="Добавить шаги",
-                    why="Шаги увеличивают расход энергии без сильной нагрузки на восстановление.",
-                    next_step="Цель на 10 дней: +2000 шагов к текущему уровню (или 7000–9000/день).",
-                    priority=58,
-                    category="activity",
-                )
-            )
-    elif answers.goal == Goal.MASS_GAIN:
-        if answers.workouts_per_week >= 3:
-            recs.append(
-                Recommendation(
-                    key="strength_plan",
-                    title="Прогрессия нагрузки",
-                    why="Для набора массы важна прогрессия: постепенно увеличивайте веса/объём.",
-                    next_step="Ведите дневник тренировок: фиксируйте веса и повторы, добавляйте понемногу.",
-                    priority=60,
-                    category="activity",
-                )
-            )
-        else:
-            recs.append(
-                Recommendation(
-                    key="strength_plan",
-                    title="Силовой план с прогрессией",
-                    why="Для набора массы нужны минимум 3 силовые тренировки в неделю.",
-                    next_step="3×/нед: жим/тяга/присед (вариации) + ведите веса/повторы.",
-                    priority=60,
-                    category="activity",
-                )
-            )
+    # --- Atomic subscores (0..100) ---
+    sub = (
+        score_activity(level, workouts),
+        score_sleep(sleep_h),
+        score_stress(stress_lvl),
+        score_hydration(water),
+        score_nutrition(ff),
+        score_smoking(smokes),
+        score_age_modifier(age),
+    )
+    activity, sleep, stress, hydration, nutrition, smoking, _ = sub
 
-    # Low confidence meta-rec
-    if confidence < 70:
-        recs.append(
-            Recommendation(
-                key="data_check",
-                title="Уточнить ответы анкеты",
-                why="Есть несостыковки/крайние значения — это снижает точность рекомендаций.",
-                next_step="Проверьте сон/воду/тренировки и заполните заново — дашборд станет точнее.",
-                priority=50,
-                category="meta",
-            )
-        )
+    health = health_index(sub)
 
-    # Sort by priority descending
-    recs.sort(key=lambda x: x.priority, reverse=True)
+    # --- Derived components ---
+    neat = score_neat(level, workouts)
+    recovery_debt = score_recovery_debt(
+        sleep_h, stress_lvl, workouts
+    )
+    nutrition_stability = score_nutrition_stability(
+        ff, stress_lvl
+    )
+    habit_score = round_clamp(0.45 * nutrition + 0.35 * smoking + 0.20 * hydration)
+
+    components = {
+        "sleep": sleep,
+        "stress": stress,
+        "hydration": hydration,
+        "nutrition": nutrition,
+        "neat": neat,
+        "training_balance": balance_for_training_load(workouts),
+        # Inverted subscores and risks for the "bad" indices
+        "nutrition_gap": 100 - nutrition,
+        "activity_gap": 100 - activity,
+        "sleep_gap": 100 - sleep,
+        "hydration_gap": 100 - hydration,
+        "smoking_risk": bool_to_risk(smokes),
+        "age_risk": age_risk(age),
+    }
+    recovery = linear_score(COMPOSITE_WEIGHTS["recovery"], components)
+    lifestyle = linear_score(COMPOSITE_WEIGHTS["lifestyle"], components)
+    energy = linear_score(COMPOSITE_WEIGHTS["energy"], components)
 
-    # Dedupe by key
-    seen: set[str] = set()
-    unique_recs: list[Recommendation] = []
-    for r in recs:
-        if r.key and r.key not in seen:
-            seen.add(r.key)
-            unique_recs.append(r)
+    # "Bad" indices: higher means worse
+    metabolic_load = linear_score(COMPOSITE_WEIGHTS["metabolic_load"], components)
+    cardio_risk = linear_score(COMPOSITE_WEIGHTS["cardio_risk"], components)
 
-    return unique_recs
+    consistency = score_consistency(
+        workouts,
+        sleep_h,
+        ff,
+        water,
+    )
+    readiness = score_readiness(recovery, energy, cardio_risk, metabolic_load)
 
+    return (
+        *sub,
+        health,
+        neat,
+        recovery_debt,
+        nutrition_stability,
+        habit_score,
+        recovery,
+        lifestyle,
+        energy,
+        metabolic_load,
+        cardio_risk,
+        consistency,
+        readiness,
+    )
 
-# ---------- Main Function ----------
 
 def generate_insights(answers: SurveyAnswers) -> Summary:
     """
     Main entry point - generate full insights summary from survey answers.
     This is the Python port of the Go GenerateInsights function.
+
+    Results are memoized on the answer values (minus the name); the name
+    and generated_at are spliced into a shallow copy per call. The returned
+    Summary shares nested objects with the cached one, so treat it as
+    read-only.
     """
-    # Validate and get data quality notes
-    dq, notes = validate(answers)
+    name = answers.name.strip()
+    return personalize_summary(_generate_cached(*summary_key(answers, name)), name)
 
-    # Get name (with fallback)
-    name = answers.name.strip() or "пользователь"
 
-    # --- Atomic subscores (0..100) ---
-    sub = {
-        "activity": score_activity(answers.activity_level, answers.workouts_per_week),
-        "sleep": score_sleep(answers.sleep_hours),
-        "stress": score_stress(answers.stress_level),
-        "hydration": score_hydration(answers.water_liters),
-        "nutrition": score_nutrition(answers.fastfood_frequency),
-        "smoking": score_smoking(answers.smokes),
-        "age": score_age_modifier(answers.age),
-    }
+def summary_key(answers: SurveyAnswers, name: str) -> tuple[bool, tuple]:
+    """
+    Memo key for a survey: whether the stripped `name` is set, plus every
+    other answer value. Surveys with equal keys differ only in the name.
+    """
+    return bool(name), _key_values(answers)
 
-    # Weights (proprietary, tunable)
-    weights = {
-        "activity": 20,
-        "sleep": 20,
-        "stress": 18,
-        "hydration": 10,
-        "nutrition": 18,
-        "smoking": 10,
-        "age": 4,
-    }
 
-    health = weighted_average(sub, weights)
+def personalize_summary(summary: Summary, name: str) -> Summary:
+    """
+    Shallow copy of a summary built for summary_key() (named surveys with
+    SUMMARY_NAME_PLACEHOLDER), with the stripped `name` spliced in and a
+    fresh generated_at.
+    """
+    update = {"generated_at": utc_now_iso()}
+    if name:
+        text = summary.insight.summary_text
+        update["user"] = summary.user.model_copy(update={"name": name})
+        update["insight"] = summary.insight.model_copy(
+            update={"summary_text": summary_greeting(name) + text[_PLACEHOLDER_GREETING_LEN:]}
+        )
+    return summary.model_copy(update=update)
 
-    # --- Derived components ---
-    neat = score_neat(answers.activity_level, answers.workouts_per_week)
-    recovery_debt = score_recovery_debt(
-        answers.sleep_hours, answers.stress_level, answers.workouts_per_week
-    )
-    nutrition_stability = score_nutrition_stability(
-        answers.fastfood_frequency, answers.stress_level
-    )
-    habit_score = clamp(
-        int(
-            round(
-                0.45 * sub["nutrition"] + 0.35 * sub["smoking"] + 0.20 * sub["hydration"]
-            )
-        ),
-        0,
-        100,
-    )
 
-    activity_score = sub["activity"]
+_PLACEHOLDER_GREETING_LEN = len(summary_greeting(SUMMARY_NAME_PLACEHOLDER))
 
-    recovery = clamp(
-        int(
-            round(
-                0.55 * sub["sleep"]
-                + 0.30 * sub["stress"]
-                + 0.15 * balance_for_training_load(answers.workouts_per_week)
-            )
-        ),
-        0,
-        100,
-    )
 
-    lifestyle = clamp(
-        int(
-            round(
-                0.22 * sub["sleep"]
-                + 0.22 * sub["stress"]
-                + 0.20 * sub["nutrition"]
-                + 0.18 * sub["hydration"]
-                + 0.18 * neat
-            )
-        ),
-        0,
-        100,
+@lru_cache(maxsize=INSIGHTS_CACHE_SIZE)
+def _generate_cached(has_name: bool, values: tuple) -> Summary:
+    """
+    Compute insights for a tuple of answer values (see _KEY_FIELDS).
+    Named surveys are computed with a placeholder name.
+    """
+    answers = SurveyAnswers.model_construct(
+        name=SUMMARY_NAME_PLACEHOLDER if has_name else "", **dict(zip(_KEY_FIELDS, values))
     )
+    return _generate_impl(answers)
 
-    energy = clamp(
-        int(
-            round(0.40 * sub["sleep"] + 0.35 * sub["stress"] + 0.25 * sub["hydration"])
-        ),
-        0,
-        100,
-    )
 
-    # "Bad" indices: higher means worse
-    metabolic_load = clamp(
-        int(
-            round(
-                0.45 * (100 - sub["nutrition"])
-                + 0.25 * (100 - sub["activity"])
-                + 0.15 * (100 - sub["sleep"])
-                + 0.15 * (100 - sub["hydration"])
-            )
-        ),
-        0,
-        100,
-    )
+generate_insights.cache_clear = _generate_cached.cache_clear
 
-    cardio_risk = clamp(
-        int(
-            round(
-                0.45 * bool_to_risk(answers.smokes)
-                + 0.20 * (100 - sub["activity"])
-                + 0.20 * age_risk(answers.age)
-                + 0.15 * (100 - sub["sleep"])
-            )
-        ),
-        0,
-        100,
-    )
 
-    consistency = score_consistency(
-        answers.workouts_per_week,
-        answers.sleep_hours,
-        answers.fastfood_frequency,
-        answers.water_liters,
+def _generate_impl(answers: SurveyAnswers) -> Summary:
+    """Uncached insights computation"""
+    # Validate and get data quality notes
+    name = answers.name.strip()
+    dq_flags = validate_flags(answers, name)
+
+    if _NUMBA_AVAILABLE:
+        level, workouts, sleep, stress, water, ff, smokes, age = _score_inputs(answers)
+        scores = _compute_all_scores(
+            ACTIVITY_ORDINAL[level],
+            workouts,
+            sleep,
+            stress,
+            water,
+            FASTFOOD_ORDINAL[ff],
+            smokes,
+            age,
+            *_KERNEL_WEIGHTS,
+        )
+    else:
+        scores = compute_scores(answers)
+
+    (
+        activity,
+        sleep,
+        stress,
+        hydration,
+        nutrition,
+        smoking,
+        age,
+        health,
+        neat,
+        recovery_debt,
+        nutrition_stability,
+        habit_score,
+        recovery,
+        lifestyle,
+        energy,
+        metabolic_load,
+        cardio_risk,
+        consistency,
+        readiness,
+    ) = scores
+    sub = {
+        "activity": activity,
+        "sleep": sleep,
+        "stress": stress,
+        "hydration": hydration,
+        "nutrition": nutrition,
+        "smoking": smoking,
+        "age": age,
+    }
+    confidence = score_confidence(answers, name, dq_flags.bit_count())
+    dq, notes = data_quality_messages(dq_flags)
+
+    return build_summary(
+        answers,
+        name,
+        dq,
+        notes,
+        sub,
+        health,
+        neat,
+        recovery_debt,
+        nutrition_stability,
+        habit_score,
+        recovery,
+        lifestyle,
+        energy,
+        metabolic_load,
+        cardio_risk,
+        consistency,
+        readiness,
+        confidence,
     )
-    readiness = score_readiness(recovery, energy, cardio_risk, metabolic_load)
-    confidence = score_confidence(answers, dq)
 
-    # --- Charts data ---
-    radar = [
-        RadarPoint(key="activity", label="Активность", value=sub["activity"]),
-        RadarPoint(key="neat", label="Движение (NEAT)", value=neat),
-        RadarPoint(key="sleep", label="Сон", value=sub["sleep"]),
-        RadarPoint(key="stress", label="Стресс", value=sub["stress"]),
-        RadarPoint(key="hydration", label="Вода", value=sub["hydration"]),
-        RadarPoint(key="nutrition", label="Питание", value=sub["nutrition"]),
-        RadarPoint(key="habits", label="Привычки", value=habit_score),
-    ]
 
-    dim_bars = [
-        ChartPoint(key="activity", label="Активность", value=sub["activity"]),
-        ChartPoint(key="sleep", label="Сон", value=sub["sleep"]),
-        ChartPoint(key="stress", label="Стресс", value=sub["stress"]),
-        ChartPoint(key="hydration", label="Вода", value=sub["hydration"]),
-        ChartPoint(key="nutrition", label="Питание", value=sub["nutrition"]),
-        ChartPoint(key="habits", label="Привычки", value=habit_score),
-    ]
+def build_summary(
+    answers: SurveyAnswers,
+    name: str,
+    dq: list[str],
+    notes: list[str],
+    sub: dict[str, int],
+    health: int,
+    neat: int,
+    recovery_debt: int,
+    nutrition_stability: int,
+    habit_score: int,
+    recovery: int,
+    lifestyle: int,
+    energy: int,
+    metabolic_load: int,
+    cardio_risk: int,
+    consistency: int,
+    readiness: int,
+    confidence: int,
+    percentile_values: Optional[list[int]] = None,
+    risk_values: Optional[list[int]] = None,
+    good: Optional[int] = None,
+) -> Summary:
+    """
+    Assemble the full Summary (charts, texts, recommendations) from computed
+    scores. Shared by generate_insights and the batch scorer, which passes
+    precomputed percentile, normalized risk and donut values.
+    """
+    name = name or "пользователь"
+    activity_score = sub["activity"]
 
-    risk_comp = [
-        ChartPoint(key="smoking_risk", label="Курение", value=bool_to_risk(answers.smokes)),
-        ChartPoint(key="sleep_risk", label="Сон", value=100 - sub["sleep"]),
-        ChartPoint(key="stress_risk", label="Стресс", value=100 - sub["stress"]),
-        ChartPoint(key="activity_risk", label="Активность", value=100 - sub["activity"]),
-        ChartPoint(key="nutrition_risk", label="Питание", value=100 - sub["nutrition"]),
+    # --- Charts data ---
+    radar = [
+        RadarPoint(key=key, label=label, value=value)
+        for (key, label), value in zip(
+            RADAR_POINTS,
+            (
+                sub["activity"],
+                neat,
+                sub["sleep"],
+                sub["stress"],
+                sub["hydration"],
+                sub["nutrition"],
+                habit_score,
+            ),
+        )
     ]
 
-    percentiles = build_percentiles(health, activity_score, recovery, lifestyle, cardio_risk)
-
-    good = clamp(
-        int(
-            round(
-                0.30 * health
-                + 0.20 * recovery
-                + 0.20 * lifestyle
-                + 0.15 * energy
-                + 0.15 * consistency
-            )
+    dim_bars = chart_points(
+        DIMENSION_POINTS,
+        (
+            sub["activity"],
+            sub["sleep"],
+            sub["stress"],
+            sub["hydration"],
+            sub["nutrition"],
+            habit_score,
         ),
-        0,
-        100,
     )
+
+    if risk_values is None:
+        risk_values = normalize_values_to_100(
+            (
+                bool_to_risk(answers.smokes),
+                100 - sub["sleep"],
+                100 - sub["stress"],
+                100 - sub["activity"],
+                100 - sub["nutrition"],
+            )
+        )
+    risk_comp = chart_points(RISK_POINTS, risk_values)
+
+    if percentile_values is None:
+        percentiles = build_percentiles(
+            health, activity_score, recovery, lifestyle, cardio_risk
+        )
+    else:
+        percentiles = chart_points(PERCENTILE_POINTS, percentile_values)
+
+    if good is None:
+        good = linear_score(
+            COMPOSITE_WEIGHTS["good"],
+            {
+                "health": health,
+                "recovery": recovery,
+                "lifestyle": lifestyle,
+                "energy": energy,
+                "consistency": consistency,
+            },
+        )
     donut = Donut(good=good, needs_work=100 - good)
 
     targets = build_targets(sub, neat, habit_score, recovery_debt, answers.workouts_per_week)
@@ -1155,7 +1699,7 @@ def generate_insights(answers: SurveyAnswers) -> Summary:
     charts = Charts(
         dimensions=dim_bars,
         good_vs_needs_work=donut,
-        risk_composition=normalize_to_100(risk_comp),
+        risk_composition=risk_comp,
         percentiles=percentiles,
         targets=targets,
     )
@@ -1180,7 +1724,7 @@ def generate_insights(answers: SurveyAnswers) -> Summary:
     # --- Build Debug ---
     debug = Debug(
         sub_scores=sub,
-        weights=weights,
+        weights=HEALTH_WEIGHTS,
         notes=notes,
     )
 
@@ -1195,6 +1739,6 @@ def generate_insights(answers: SurveyAnswers) -> Summary:
         recommendations=recommendations,
         flags=flags,
         debug=debug,
-        generated_at=datetime.now(timezone.utc).isoformat(),
+        generated_at=utc_now_iso(),
         version="insights.v2",
     )
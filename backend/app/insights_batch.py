@@ -0,0 +1,351 @@
+"""
+Vectorized batch scoring for Fizikl insights
+
+Computes the same scores as insights.generate_insights for many surveys at
+once: answers are split into NumPy columns and every subscore/composite is a
+single array expression. Float operations are kept in the same order as the
+scalar helpers and np.rint rounds half-to-even like round(), so the output is
+identical to the per-survey path.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from .insights import (
+    ACTIVITY_BASE,
+    COMPOSITE_WEIGHTS,
+    FASTFOOD_CONSISTENCY,
+    FASTFOOD_SCORES,
+    HEALTH_WEIGHTS,
+    NEAT_BASE,
+    SUMMARY_NAME_PLACEHOLDER,
+    DataQuality,
+    build_summary,
+    data_quality_messages,
+    personalize_summary,
+    summary_key,
+)
+from .models import (
+    ACTIVITY_ORDINAL,
+    FASTFOOD_ORDINAL,
+    ActivityLevel,
+    FastFoodFrequency,
+    Summary,
+    SurveyAnswers,
+)
+
+
+# ---------- Lookup Tables ----------
+
+# The scalar tables as arrays indexed by ActivityLevel / FastFoodFrequency
+# ordinal (declaration order), so both paths share one source of values
+_ACTIVITY_BASE_LUT = np.array([ACTIVITY_BASE[m] for m in ActivityLevel], dtype=np.int64)
+_NEAT_BASE_LUT = np.array([NEAT_BASE[m] for m in ActivityLevel], dtype=np.int64)
+_NUTRITION_LUT = np.array([FASTFOOD_SCORES[m] for m in FastFoodFrequency], dtype=np.int64)
+_CONSISTENCY_FASTFOOD_LUT = np.array(
+    [FASTFOOD_CONSISTENCY[m] for m in FastFoodFrequency], dtype=np.int64
+)
+
+_SUB_KEYS = tuple(HEALTH_WEIGHTS)
+_WEIGHTS = np.array([HEALTH_WEIGHTS[k] for k in _SUB_KEYS], dtype=np.int64)
+_WEIGHTS_SUM = int(_WEIGHTS.sum())
+
+# build_percentiles: value * scale + offset for health/activity/recovery/balance
+_PCT_SCALE = np.array([0.9, 0.95, 0.9, 0.9])
+_PCT_OFFSET = np.array([10, 5, 10, 10])
+
+_LOW = ACTIVITY_ORDINAL[ActivityLevel.LOW]
+_HIGH = ACTIVITY_ORDINAL[ActivityLevel.HIGH]
+
+
+# ---------- Helpers ----------
+
+def _round_clip(values: np.ndarray, lo: int = 0, hi: int = 100) -> np.ndarray:
+    """Vector form of clamp(int(round(x)), lo, hi)"""
+    return np.clip(np.rint(values), lo, hi).astype(np.int64)
+
+
+def _linear_score(
+    terms: tuple[tuple[str, float], ...], components: dict[str, np.ndarray]
+) -> np.ndarray:
+    """Vector form of insights.linear_score (same summation order)"""
+    total = np.zeros(len(next(iter(components.values()))))
+    for key, weight in terms:
+        total = total + weight * components[key]
+    return _round_clip(total)
+
+
+@dataclass(slots=True, frozen=True)
+class AnswersArrays:
+    """
+    Survey answers as column arrays (structure of arrays).
+    Enums are stored as ordinals in declaration order.
+    """
+    level: np.ndarray
+    workouts: np.ndarray
+    sleep: np.ndarray
+    stress: np.ndarray
+    water: np.ndarray
+    ff: np.ndarray
+    smokes: np.ndarray
+    age: np.ndarray
+    no_name: np.ndarray
+
+    @classmethod
+    def from_answers(
+        cls, answers_list: Sequence[SurveyAnswers], names: Sequence[str]
+    ) -> "AnswersArrays":
+        """Build from answers and their stripped names"""
+        n = len(answers_list)
+        return cls(
+            level=np.fromiter(
+                (ACTIVITY_ORDINAL[a.activity_level] for a in answers_list), np.int64, n
+            ),
+            workouts=np.fromiter(
+                (a.workouts_per_week for a in answers_list), np.int64, n
+            ),
+            sleep=np.fromiter((a.sleep_hours for a in answers_list), np.float64, n),
+            stress=np.fromiter((a.stress_level for a in answers_list), np.int64, n),
+            water=np.fromiter((a.water_liters for a in answers_list), np.float64, n),
+            ff=np.fromiter(
+                (FASTFOOD_ORDINAL[a.fastfood_frequency] for a in answers_list),
+                np.int64,
+                n,
+            ),
+            smokes=np.fromiter((a.smokes for a in answers_list), np.bool_, n),
+            age=np.fromiter((a.age for a in answers_list), np.int64, n),
+            no_name=np.fromiter((not name for name in names), np.bool_, n),
+        )
+
+
+def normalize_to_100_batch(values: np.ndarray) -> np.ndarray:
+    """
+    Row-wise normalize_to_100 for an (N, K) array.
+    Rows summing to 0 are returned unchanged.
+    """
+    vals = np.maximum(0, values)
+    total = vals.sum(axis=1, keepdims=True)
+    safe_total = np.where(total == 0, 1, total)
+    pct = np.clip(np.rint(vals * 100.0 / safe_total).astype(np.int64), 0, 100)
+    # Last slice absorbs rounding so each row sums to 100
+    pct[:, -1] = np.clip(100 - pct[:, :-1].sum(axis=1), 0, 100)
+    return np.where(total == 0, values, pct)
+
+
+# ---------- Batch Scoring ----------
+
+def score_batch(c: AnswersArrays) -> dict[str, np.ndarray]:
+    """
+    Compute every numeric score for a batch of surveys.
+    Returns a mapping of score name -> int64 array of length N ("dq_flags"
+    holds DataQuality bitmasks); "sub", "percentile_values" and
+    "risk_values" are (N, K) arrays.
+    """
+    level, workouts, sleep = c.level, c.workouts, c.sleep
+    stress, water, ff, age = c.stress, c.water, c.ff, c.age
+
+    # --- Atomic subscores ---
+    mismatch = np.where((level >= _HIGH) & (workouts <= 1), 10, 0) + np.where(
+        (level == _LOW) & (workouts >= 5), 6, 0
+    )
+    activity = np.clip(
+        _ACTIVITY_BASE_LUT[level] + np.clip(workouts * 4, 0, 28) - mismatch, 0, 100
+    )
+
+    diff = np.abs(sleep - 8.0)
+    sleep_score = _round_clip(100.0 - (diff * diff * 6.0))
+    stress_score = np.clip(110 - stress * 10, 0, 100)
+    hydration = np.where(water <= 0, 0, _round_clip(40 + water * 24))
+    nutrition = _NUTRITION_LUT[ff]
+    smoking = np.where(c.smokes, 20, 90)
+    age_t = (age - 18) / (80 - 18)
+    age_mod = _round_clip(95 - age_t * 40)
+
+    sub = np.stack(
+        [activity, sleep_score, stress_score, hydration, nutrition, smoking, age_mod],
+        axis=1,
+    )
+    health = _round_clip((sub @ _WEIGHTS) / _WEIGHTS_SUM)
+
+    # --- Derived components ---
+    neat = np.clip(_NEAT_BASE_LUT[level] + np.clip(workouts * 3, 0, 18), 0, 100)
+
+    debt = np.where(sleep < 7.0, (7.0 - sleep) * 18.0, 0.0)
+    debt = debt + np.maximum(0, stress - 5) * 8.0
+    debt = debt + np.where(workouts >= 5, (workouts - 4) * 7.0, 0.0)
+    recovery_debt = _round_clip(debt)
+
+    stability_penalty = np.where(stress >= 8, 12, np.where(stress >= 6, 6, 0))
+    nutrition_stability = np.clip(nutrition - stability_penalty, 0, 100)
+
+    habit_score = _round_clip(0.45 * nutrition + 0.35 * smoking + 0.20 * hydration)
+
+    training_balance = np.select(
+        [workouts == 0, workouts <= 2, workouts <= 4, workouts <= 6],
+        [60, 75, 90, 80],
+        70,
+    )
+    components = {
+        "sleep": sleep_score,
+        "stress": stress_score,
+        "hydration": hydration,
+        "nutrition": nutrition,
+        "neat": neat,
+        "training_balance": training_balance,
+        "nutrition_gap": 100 - nutrition,
+        "activity_gap": 100 - activity,
+        "sleep_gap": 100 - sleep_score,
+        "hydration_gap": 100 - hydration,
+        "smoking_risk": np.where(c.smokes, 90, 10),
+        "age_risk": _round_clip(10 + age_t * 60),
+    }
+    recovery = _linear_score(COMPOSITE_WEIGHTS["recovery"], components)
+    lifestyle = _linear_score(COMPOSITE_WEIGHTS["lifestyle"], components)
+    energy = _linear_score(COMPOSITE_WEIGHTS["energy"], components)
+    metabolic_load = _linear_score(COMPOSITE_WEIGHTS["metabolic_load"], components)
+    cardio_risk = _linear_score(COMPOSITE_WEIGHTS["cardio_risk"], components)
+
+    consistency = np.full(len(level), 60, dtype=np.int64)
+    consistency += np.select(
+        [workouts == 0, workouts == 1, workouts <= 4], [-10, -5, 10], 6
+    )
+    consistency += np.where(
+        (sleep >= 7.0) & (sleep <= 9.0), 12, np.where(sleep < 6.0, -12, -4)
+    )
+    consistency += _CONSISTENCY_FASTFOOD_LUT[ff]
+    consistency += np.where(water >= 1.8, 6, np.where(water < 1.0, -8, 0))
+    consistency = np.clip(consistency, 0, 100)
+
+    readiness = 0.55 * recovery + 0.45 * energy
+    readiness = readiness - 0.20 * cardio_risk
+    readiness = readiness - 0.10 * metabolic_load
+    readiness = _round_clip(readiness)
+
+    # Same checks as validate_flags()
+    dq_flags = (
+        np.where(c.no_name, DataQuality.NAME_MISSING, 0)
+        | np.where(
+            (workouts == 0) & (level >= _HIGH),
+            DataQuality.MISMATCH_HIGH_NO_WORKOUTS,
+            0,
+        )
+        | np.where(
+            (workouts >= 6) & (level == _LOW),
+            DataQuality.MISMATCH_LOW_MANY_WORKOUTS,
+            0,
+        )
+        | np.where(water == 0, DataQuality.WATER_ZERO, 0)
+        | np.where(sleep <= 4.5, DataQuality.SLEEP_VERY_LOW, 0)
+    )
+    dq_count = np.bitwise_count(dq_flags).astype(np.int64)
+    confidence = 92 - np.where(c.no_name, 2, 0) - dq_count * 6
+    confidence -= np.where((sleep <= 4.5) | (sleep >= 11.5), 6, 0)
+    confidence -= np.where((water == 0) | (water >= 4.8), 6, 0)
+    confidence = np.clip(confidence, 40, 100)
+
+    good = _linear_score(
+        COMPOSITE_WEIGHTS["good"],
+        {
+            "health": health,
+            "recovery": recovery,
+            "lifestyle": lifestyle,
+            "energy": energy,
+            "consistency": consistency,
+        },
+    )
+
+    percentiles = np.empty((len(level), 5), dtype=np.int64)
+    percentiles[:, :4] = _round_clip(
+        np.stack([health, activity, recovery, lifestyle], axis=1) * _PCT_SCALE
+        + _PCT_OFFSET
+    )
+    percentiles[:, 4] = np.clip(100 - cardio_risk, 0, 100)
+
+    risk_values = normalize_to_100_batch(
+        np.stack(
+            [
+                components["smoking_risk"],
+                100 - sleep_score,
+                100 - stress_score,
+                100 - activity,
+                100 - nutrition,
+            ],
+            axis=1,
+        )
+    )
+
+    return {
+        "dq_flags": dq_flags,
+        "sub": sub,
+        "percentile_values": percentiles,
+        "risk_values": risk_values,
+        "health": health,
+        "neat": neat,
+        "recovery_debt": recovery_debt,
+        "nutrition_stability": nutrition_stability,
+        "habit_score": habit_score,
+        "recovery": recovery,
+        "lifestyle": lifestyle,
+        "energy": energy,
+        "metabolic_load": metabolic_load,
+        "cardio_risk": cardio_risk,
+        "consistency": consistency,
+        "readiness": readiness,
+        "good": good,
+        "confidence": confidence,
+    }
+
+
+def generate_insights_batch(answers_list: Sequence[SurveyAnswers]) -> list[Summary]:
+    """
+    Generate insights for many surveys at once.
+    Output matches [generate_insights(a) for a in answers_list].
+
+    Surveys with the same summary_key() (identical answers apart from the
+    name) are scored and assembled once and personalized per row, like the
+    generate_insights memo. The returned Summaries share nested objects, so
+    treat them as read-only.
+    """
+    if not answers_list:
+        return []
+
+    names = [a.name.strip() for a in answers_list]
+
+    slots: dict[tuple, int] = {}
+    unique: list[SurveyAnswers] = []
+    unique_names: list[str] = []
+    row_slots: list[int] = []
+    for answers, name in zip(answers_list, names):
+        key = summary_key(answers, name)
+        slot = slots.get(key)
+        if slot is None:
+            slot = slots[key] = len(unique)
+            unique.append(answers)
+            unique_names.append(SUMMARY_NAME_PLACEHOLDER if name else "")
+        row_slots.append(slot)
+
+    scores = score_batch(AnswersArrays.from_answers(unique, unique_names))
+    dq_flags = scores.pop("dq_flags").tolist()
+    sub_rows = scores.pop("sub").tolist()
+    columns = {key: arr.tolist() for key, arr in scores.items()}
+
+    templates: list[Summary] = []
+    for i, answers in enumerate(unique):
+        dq, notes = data_quality_messages(dq_flags[i])
+        templates.append(
+            build_summary(
+                answers,
+                unique_names[i],
+                dq,
+                notes,
+                dict(zip(_SUB_KEYS, sub_rows[i])),
+                **{key: values[i] for key, values in columns.items()},
+            )
+        )
+
+    return [
+        personalize_summary(templates[slot], name)
+        for slot, name in zip(row_slots, names)
+    ]
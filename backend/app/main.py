@@ -3,17 +3,49 @@ Fizikl Backend API
 Health survey with personalized insights
 """
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.types import Receive, Scope, Send
 
-# Import database to initialize on startup
-from . import database  # noqa: F401
+from .database import flush_writes, init_db
 from .routes import router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Initialize the database once per worker process on startup and commit
+    any still-queued saves on shutdown
+    """
+    init_db()
+    yield
+    flush_writes()
+
+
+# Liveness probes don't come from browsers, so they skip the CORS layer
+CORS_EXEMPT_PATHS = frozenset({"/health"})
+
+
+class ProbeAwareCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that passes CORS_EXEMPT_PATHS straight to the app"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in CORS_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
 app = FastAPI(
     title="Fizikl API",
     description="Health survey backend with personalized insights",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Include API routes
@@ -21,7 +53,7 @@ app.include_router(router)
 
 # CORS middleware for frontend
 app.add_middleware(
-    CORSMiddleware,
+    ProbeAwareCORSMiddleware,
     allow_origins=["http://localhost:3000"],
     allow_credentials=True,
     allow_methods=["*"],
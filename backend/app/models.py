@@ -36,6 +36,12 @@ class FastFoodFrequency(str, Enum):
     VERY_OFTEN = "Очень часто"
 
 
+# Enum member -> ordinal in declaration order, for table-indexed scoring
+# (NumPy gathers in the batch scorer, int branches in the Numba kernel)
+ACTIVITY_ORDINAL: dict[ActivityLevel, int] = {m: i for i, m in enumerate(ActivityLevel)}
+FASTFOOD_ORDINAL: dict[FastFoodFrequency, int] = {m: i for i, m in enumerate(FastFoodFrequency)}
+
+
 # ---------- Input Model ----------
 
 class SurveyAnswers(BaseModel):
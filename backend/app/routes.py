@@ -2,17 +2,45 @@
 API routes for Fizikl Health Survey
 """
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+from typing import Annotated, Final
 
-from .database import get_survey, save_survey
+from fastapi import APIRouter, Body, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter, ValidationError
+
+from .database import get_survey_json, queue_survey, save_surveys_bulk
 from .insights import generate_insights
+from .insights_batch import generate_insights_batch
 from .models import SurveyAnswers, SurveyRecord, SurveyResponse
 
 router = APIRouter(prefix="/api", tags=["survey"])
 
+# Max surveys per /survey/batch request
+SURVEY_BATCH_MAX = 1000
+
+# submit_survey parses the raw body with this adapter (one pydantic-core
+# call from bytes) instead of FastAPI's json.loads + body field validation
+_SURVEY_ADAPTER: Final = TypeAdapter(SurveyAnswers)
+
+# Request body schema for the OpenAPI docs; enum $defs are shared
+# components already emitted for the other survey models
+_SURVEY_SCHEMA = _SURVEY_ADAPTER.json_schema(ref_template="#/components/schemas/{model}")
+_SURVEY_SCHEMA.pop("$defs", None)
+
 
-@router.post("/survey", response_model=SurveyResponse)
-async def submit_survey(answers: SurveyAnswers) -> SurveyResponse:
+@router.post(
+    "/survey",
+    response_model=SurveyResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _SURVEY_SCHEMA}},
+        }
+    },
+)
+async def submit_survey(request: Request) -> ORJSONResponse:
     """
     Submit survey answers and get personalized health insights.
 
@@ -21,24 +49,70 @@ async def submit_survey(answers: SurveyAnswers) -> SurveyResponse:
     - Saves results to database
     - Returns unique ID and full results
     """
+    try:
+        answers = _SURVEY_ADAPTER.validate_json(await request.body())
+    except ValidationError as exc:
+        # Same 422 body FastAPI produces for a declared body parameter
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in exc.errors(include_url=False)
+            ]
+        ) from None
+
     # Generate insights from answers
     results = generate_insights(answers)
 
-    # Save to database
-    survey_id = save_survey(answers, results)
+    # Save to database: the background writer group-commits it shortly
+    # after; the ID is readable via /results right away
+    survey_id = queue_survey(answers, results)
+
+    # Summary is already validated; skip FastAPI's re-validation of the
+    # response model and encode the plain dict with orjson
+    return ORJSONResponse(
+        {"id": survey_id, "results": results.model_dump(mode="python")}
+    )
+
+
+@router.post("/survey/batch", response_model=list[SurveyResponse])
+async def submit_survey_batch(
+    answers_list: Annotated[list[SurveyAnswers], Body(max_length=SURVEY_BATCH_MAX)]
+) -> ORJSONResponse:
+    """
+    Submit many surveys in one request.
+
+    - Scores the whole batch with the vectorized scorer
+    - Saves all results in a single transaction
+    - Returns IDs and results in input order
+    """
+    # Scoring, saving and encoding up to SURVEY_BATCH_MAX surveys takes a
+    # noticeable fraction of a second, so all of it runs off the event loop
+    return await asyncio.to_thread(_submit_batch, answers_list)
+
+
+def _submit_batch(answers_list: list[SurveyAnswers]) -> ORJSONResponse:
+    """Score, save and encode a survey batch (blocking)"""
+    results_list = generate_insights_batch(answers_list)
+    survey_ids = save_surveys_bulk(list(zip(answers_list, results_list)))
 
-    return SurveyResponse(id=survey_id, results=results)
+    return ORJSONResponse(
+        [
+            {"id": survey_id, "results": results.model_dump(mode="python")}
+            for survey_id, results in zip(survey_ids, results_list)
+        ]
+    )
 
 
 @router.get("/results/{survey_id}", response_model=SurveyRecord)
-async def get_results(survey_id: str) -> SurveyRecord:
+async def get_results(survey_id: str) -> Response:
     """
     Retrieve survey results by ID.
 
     - Returns full survey record including answers and results
     - Returns 404 if survey not found
     """
-    record = get_survey(survey_id)
+    # Stored JSON is sent as-is; no model is built or re-serialized
+    record = get_survey_json(survey_id)
 
     if record is None:
         raise HTTPException(
@@ -46,4 +120,4 @@ async def get_results(survey_id: str) -> SurveyRecord:
             detail=f"Survey with ID '{survey_id}' not found"
         )
 
-    return record
+    return Response(content=record, media_type="application/json")
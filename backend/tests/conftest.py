@@ -0,0 +1,70 @@
+"""
+Shared fixtures: every database test gets its own SQLite file under tmp_path
+and a fresh set of module-level connection state in app.database.
+"""
+
+import queue
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import database
+from app.main import app
+from app.models import SurveyAnswers
+
+
+@pytest.fixture
+def db_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """
+    Point app.database at an empty file in tmp_path. init_db() is left to the
+    test (or to the app lifespan), so a test can lay out an old schema first.
+    """
+    path = tmp_path / "fizikl.db"
+    monkeypatch.setattr(database, "DB_PATH", path)
+    monkeypatch.setattr(
+        database, "_MEM_DB_URI", f"file:fizikl_recent_{id(path)}?mode=memory&cache=shared"
+    )
+    monkeypatch.setattr(database, "_read_pool", queue.LifoQueue(maxsize=database.READ_POOL_SIZE))
+    monkeypatch.setattr(database, "_write_conn", None)
+    monkeypatch.setattr(database, "_pending", {})
+    monkeypatch.setattr(database, "_initialized", False)
+    database._get_survey_json_cached.cache_clear()
+
+    yield path
+
+    # Runs before monkeypatch restores the globals, so queued saves still
+    # land in this test's file
+    if database._initialized:
+        database.flush_writes()
+    if database._write_conn is not None:
+        database._write_conn.close()
+    while not database._read_pool.empty():
+        database._read_pool.get_nowait().close()
+    database._get_survey_json_cached.cache_clear()
+
+
+@pytest.fixture
+def db(db_path: Path) -> Path:
+    """An initialized, empty database"""
+    database.init_db()
+    return db_path
+
+
+@pytest.fixture
+def client(db_path: Path) -> Iterator[TestClient]:
+    """TestClient with the app lifespan (init_db / flush_writes) running"""
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def survey_json() -> dict[str, Any]:
+    """The documented example request body"""
+    return dict(SurveyAnswers.model_config["json_schema_extra"]["example"])
+
+
+@pytest.fixture
+def answers(survey_json: dict[str, Any]) -> SurveyAnswers:
+    return SurveyAnswers.model_validate(survey_json)
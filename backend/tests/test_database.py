@@ -0,0 +1,193 @@
+"""
+Storage layer: schema migration, the background writer (queue, retries)
+and bulk saves.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from app import database
+from app.insights import generate_insights
+from app.models import ActivityLevel
+
+
+def test_migrates_v0_database(db_path, answers):
+    """A pre-versioning table (TEXT payloads, ISO created_at) is rebuilt as v5"""
+    results = generate_insights(answers)
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE surveys (
+            id TEXT PRIMARY KEY,
+            answers JSON NOT NULL,
+            results JSON NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("CREATE INDEX idx_surveys_created_at ON surveys(created_at DESC)")
+    conn.executemany(
+        "INSERT INTO surveys VALUES (?, ?, ?, ?)",
+        [
+            ("old-1", answers.model_dump_json(), results.model_dump_json(),
+             "2025-01-02T03:04:05.123456"),
+            ("old-2", answers.model_dump_json(), results.model_dump_json(),
+             "2025-01-02 03:04:06"),
+        ]
+    )
+    conn.commit()
+    conn.close()
+
+    database.init_db()
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA user_version").fetchone() == (database.SCHEMA_VERSION,)
+    assert conn.execute(
+        "SELECT id, created_at, typeof(answers), typeof(results) FROM surveys ORDER BY id"
+    ).fetchall() == [
+        ("old-1", 1735787045123456, "blob", "blob"),
+        ("old-2", 1735787046000000, "blob", "blob"),
+    ]
+    assert [
+        row[2] for row in conn.execute("PRAGMA index_xinfo(idx_surveys_created_at)")
+    ][:2] == ["created_at", "id"]
+    conn.close()
+
+    record = database.get_survey("old-1")
+    assert record.answers == answers
+    assert record.results == results
+    assert record.created_at == datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc)
+    assert [r.id for r in database.get_recent_surveys(10)] == ["old-2", "old-1"]
+
+
+def test_queued_survey_is_readable_before_commit(db, answers):
+    results = generate_insights(answers)
+
+    # Holding the writer lock stalls the background writer
+    with database._write_lock:
+        survey_id = database.queue_survey(answers, results)
+        assert survey_id in database._pending
+
+        with database.borrow_conn() as conn:
+            assert conn.execute(database._SQL_GET_SURVEY, (survey_id,)).fetchone() is None
+
+        assert database.get_survey(survey_id).results == results
+        assert database.get_survey_json(survey_id) is not None
+
+    database.flush_writes()
+
+    assert database._pending == {}
+    assert database.get_survey(survey_id).results == results
+
+
+def test_save_survey_waits_for_commit(db, answers):
+    survey_id = database.save_survey(answers, generate_insights(answers))
+
+    assert survey_id not in database._pending
+    with database.borrow_conn() as conn:
+        assert conn.execute(database._SQL_GET_SURVEY, (survey_id,)).fetchone() is not None
+
+
+def _failing_insert(monkeypatch, failures):
+    """Make the first `failures` group commits raise; returns the call log"""
+    calls = []
+    insert = database._insert_surveys
+
+    def flaky_insert(conn, rows):
+        calls.append([row[0] for row in rows])
+        if len(calls) <= failures:
+            raise database.sqlite3.OperationalError("disk I/O error")
+        insert(conn, rows)
+
+    monkeypatch.setattr(database, "_insert_surveys", flaky_insert)
+    monkeypatch.setattr(database, "WRITE_RETRY_DELAY", 0)
+    return calls
+
+
+def test_failed_commit_is_retried(db, answers, monkeypatch, caplog):
+    calls = _failing_insert(monkeypatch, failures=1)
+
+    future = database.enqueue_survey(answers, generate_insights(answers))
+    database.flush_writes()
+
+    survey_id = future.result(timeout=0)
+    assert calls == [[survey_id], [survey_id]]
+    assert database.get_survey(survey_id) is not None
+    assert "retrying" in caplog.text
+
+
+def test_commit_gives_up_after_retries(db, answers, monkeypatch, caplog):
+    calls = _failing_insert(monkeypatch, failures=database.WRITE_RETRIES + 1)
+    caplog.set_level(logging.WARNING, logger=database.__name__)
+
+    future = database.enqueue_survey(answers, generate_insights(answers))
+    database.flush_writes()
+
+    assert isinstance(future.exception(timeout=0), database.sqlite3.OperationalError)
+    assert len(calls) == database.WRITE_RETRIES + 1
+    assert database._pending == {}
+    assert database.get_survey(calls[0][0]) is None
+    assert "Giving up on 1 survey(s)" in caplog.text
+
+    # The writer thread survived and the connection is usable again (the
+    # next insert goes through)
+    survey_id = database.save_survey(answers, generate_insights(answers))
+    assert database.get_survey(survey_id) is not None
+
+
+def test_cancelled_future_still_saves(db, answers):
+    results = generate_insights(answers)
+
+    with database._write_lock:
+        # The writer picks this one up and blocks on the lock, so the next
+        # save stays queued (and cancellable) until the lock is released
+        database.queue_survey(answers, results)
+        survey_id = database.queue_survey(answers, results)
+        future = database.enqueue_survey(answers, results)
+        assert future.cancel()
+
+    database.flush_writes()
+
+    assert database._pending == {}
+    assert database.get_survey(survey_id) is not None
+    with database.borrow_conn() as conn:
+        assert conn.execute("SELECT count(*) FROM surveys").fetchone() == (3,)
+    # The writer is still running
+    assert database.get_survey(database.save_survey(answers, results)) is not None
+
+
+def test_save_surveys_bulk(db, answers):
+    items = [
+        (variant, generate_insights(variant))
+        for variant in (
+            answers.model_copy(update={"activity_level": level, "name": f"user {i}"})
+            for i, level in enumerate(ActivityLevel)
+        )
+    ]
+
+    survey_ids = database.save_surveys_bulk(items)
+
+    assert len(survey_ids) == len(items) == len(set(survey_ids))
+    assert all(len(survey_id) == 32 for survey_id in survey_ids)
+    for survey_id, (variant, results) in zip(survey_ids, items):
+        record = database.get_survey(survey_id)
+        assert record.answers == variant
+        assert record.results == results
+    assert {r.id for r in database.get_recent_surveys_list(10)} == set(survey_ids)
+
+
+def test_get_survey_unknown_id(db):
+    assert database.get_survey("missing") is None
+    assert database.get_survey_json("missing") is None
+
+
+@pytest.mark.parametrize("limit", [1, database.RECENT_CACHE_SIZE + 1])
+def test_recent_surveys_newest_first(db, answers, limit):
+    results = generate_insights(answers)
+    survey_ids = [database.save_survey(answers, results) for _ in range(3)]
+
+    recent = database.get_recent_surveys_list(limit)
+
+    assert [r.id for r in recent] == survey_ids[::-1][:limit]
+    assert recent == list(database.get_recent_surveys(limit))
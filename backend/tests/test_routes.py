@@ -0,0 +1,107 @@
+"""
+HTTP API: single and batch survey submission, results lookup, error bodies.
+"""
+
+from app.routes import SURVEY_BATCH_MAX
+
+
+def test_submit_survey_and_get_results(client, survey_json):
+    response = client.post("/api/survey", json=survey_json)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["id"]) == 32
+    assert body["results"]["user"]["name"] == survey_json["name"]
+
+    # Readable right away, whether or not the writer has committed it yet
+    response = client.get(f"/api/results/{body['id']}")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    record = response.json()
+    assert record["id"] == body["id"]
+    assert record["answers"] == survey_json
+    assert record["results"] == body["results"]
+    assert record["created_at"].endswith("Z")
+
+
+def test_get_results_unknown_id(client):
+    response = client.get("/api/results/missing")
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Survey with ID 'missing' not found"}
+
+
+def test_submit_survey_validation_error(client, survey_json):
+    """Field errors keep the body shape FastAPI uses for declared bodies"""
+    del survey_json["age"]
+    survey_json["stress_level"] = 11
+
+    response = client.post("/api/survey", json=survey_json)
+
+    assert response.status_code == 422
+    assert response.json() == {
+        "detail": [
+            {
+                "type": "missing",
+                "loc": ["body", "age"],
+                "msg": "Field required",
+                "input": survey_json,
+            },
+            {
+                "type": "less_than_equal",
+                "loc": ["body", "stress_level"],
+                "msg": "Input should be less than or equal to 10",
+                "input": 11,
+                "ctx": {"le": 10},
+            },
+        ]
+    }
+
+
+def test_submit_survey_invalid_json(client):
+    response = client.post(
+        "/api/survey", content=b"{oops", headers={"content-type": "application/json"}
+    )
+
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert error["type"] == "json_invalid"
+    assert error["loc"] == ["body"]
+
+
+def test_submit_survey_batch(client, survey_json):
+    surveys = [
+        {**survey_json, "name": f"user {i}", "workouts_per_week": i} for i in range(8)
+    ]
+
+    response = client.post("/api/survey/batch", json=surveys)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["results"]["user"]["name"] for item in body] == [s["name"] for s in surveys]
+    for item, survey in zip(body, surveys):
+        record = client.get(f"/api/results/{item['id']}").json()
+        assert record["answers"] == survey
+        assert record["results"] == item["results"]
+
+
+def test_submit_survey_batch_matches_single(client, survey_json):
+    single = client.post("/api/survey", json=survey_json).json()["results"]
+    [batch] = client.post("/api/survey/batch", json=[survey_json]).json()
+
+    single.pop("generated_at")
+    batch["results"].pop("generated_at")
+    assert batch["results"] == single
+
+
+def test_submit_survey_batch_limit(client, survey_json):
+    response = client.post("/api/survey/batch", json=[survey_json] * SURVEY_BATCH_MAX)
+    assert response.status_code == 200
+    assert len(response.json()) == SURVEY_BATCH_MAX
+
+    response = client.post("/api/survey/batch", json=[survey_json] * (SURVEY_BATCH_MAX + 1))
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert error["type"] == "too_long"
+    assert error["loc"] == ["body"]
@@ -0,0 +1,91 @@
+"""
+Parity between the three scoring implementations: the pure-Python
+compute_scores, the (optionally Numba-compiled) _compute_all_scores kernel
+and the vectorized score_batch. All three must return identical scores.
+"""
+
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from app._scoring_numba import SCORE_FIELDS, _compute_all_scores
+from app.insights import _KERNEL_WEIGHTS, _score_inputs, compute_scores
+from app.insights_batch import AnswersArrays, score_batch
+from app.models import (
+    ACTIVITY_ORDINAL,
+    FASTFOOD_ORDINAL,
+    ActivityLevel,
+    FastFoodFrequency,
+    Goal,
+    SurveyAnswers,
+)
+
+# Threshold values used by the scoring rules, mixed into the random floats
+SLEEP_EDGES = (4.0, 4.5, 6.0, 7.0, 8.0, 9.0, 11.5, 12.0)
+WATER_EDGES = (0.0, 1.0, 1.8, 4.8, 5.0)
+
+
+def _grid() -> list[SurveyAnswers]:
+    """Every activity x fast food x workouts x stress, with random floats"""
+    rng = random.Random(20240101)
+    surveys = []
+    for level, ff, workouts, stress in itertools.product(
+        ActivityLevel, FastFoodFrequency, range(8), range(1, 11)
+    ):
+        sleep = rng.choice(SLEEP_EDGES) if rng.random() < 0.2 else rng.uniform(4, 12)
+        water = rng.choice(WATER_EDGES) if rng.random() < 0.2 else rng.uniform(0, 5)
+        surveys.append(
+            SurveyAnswers(
+                name=rng.choice(("Иван", " ")),
+                age=rng.randint(18, 80),
+                activity_level=level,
+                goal=rng.choice(list(Goal)),
+                workouts_per_week=workouts,
+                sleep_hours=round(sleep, rng.choice((1, 2, 6))),
+                stress_level=stress,
+                water_liters=round(water, rng.choice((1, 2, 6))),
+                fastfood_frequency=ff,
+                smokes=rng.random() < 0.5,
+            )
+        )
+    return surveys
+
+
+GRID = _grid()
+
+
+@pytest.fixture(scope="module")
+def python_scores() -> list[tuple[int, ...]]:
+    return [compute_scores(answers) for answers in GRID]
+
+
+def test_kernel_matches_compute_scores(python_scores):
+    for answers, expected in zip(GRID, python_scores):
+        level, workouts, sleep, stress, water, ff, smokes, age = _score_inputs(answers)
+        kernel = _compute_all_scores(
+            ACTIVITY_ORDINAL[level],
+            workouts,
+            sleep,
+            stress,
+            water,
+            FASTFOOD_ORDINAL[ff],
+            smokes,
+            age,
+            *_KERNEL_WEIGHTS,
+        )
+        assert tuple(int(v) for v in kernel) == expected, answers
+
+
+def test_score_batch_matches_compute_scores(python_scores):
+    scores = score_batch(
+        AnswersArrays.from_answers(GRID, [answers.name.strip() for answers in GRID])
+    )
+    sub = scores["sub"]
+    columns = [sub[:, i] for i in range(sub.shape[1])]
+    columns += [scores[field] for field in SCORE_FIELDS[sub.shape[1]:]]
+    batch = np.stack(columns, axis=1).tolist()
+
+    for answers, expected, row in zip(GRID, python_scores, batch):
+        assert tuple(row) == expected, answers